@@ -12,6 +12,8 @@ LangGraph 최신 ReAct 구조 베이스 코드 (Modern create_react_agent)
 """
 
 import os
+import sys
+from pathlib import Path
 
 # .env 파일에서 환경변수 로드
 from dotenv import load_dotenv
@@ -25,6 +27,10 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 from langchain_core.tools import tool
 
+# 프로젝트 루트를 경로에 추가하여 utils 모듈을 불러옵니다.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.calculator import safe_eval
+
 # 1. 도구 정의 (Tool Definition)
 @tool
 def get_weather(city: str) -> str:
@@ -53,8 +59,8 @@ def calculate(expression: str) -> str:
         expression: 계산할 수학 표현식 (예: "2 + 3 * 4", "100 / 5")
     """
     try:
-        # 문자열 수식을 실행하여 결과 계산
-        result = eval(expression)
+        # 문자열 수식을 안전하게 계산 (eval 대신 AST 기반 계산기 사용)
+        result = safe_eval(expression)
         return f"결과: {result}"
     except Exception as e:
         # 계산 중 오류 발생 시 메시지 반환
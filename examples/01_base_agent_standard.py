@@ -12,6 +12,9 @@ LangGraph 표준 구조 베이스 코드 (Standard StateGraph Structure)
 """
 
 import os
+import sys
+from functools import lru_cache
+from pathlib import Path
 from typing import Annotated, TypedDict
 
 # .env 파일에서 환경변수 로드
@@ -28,6 +31,10 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, BaseMessage
 from langchain_core.tools import tool
 
+# 프로젝트 루트를 경로에 추가하여 utils 모듈을 불러옵니다.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.calculator import safe_eval
+
 # 1. 상태 정의 (State Definition)
 # 에이전트가 대화 내내 유지하고 업데이트할 데이터 구조를 정의합니다.
 class AgentState(TypedDict):
@@ -62,8 +69,8 @@ def calculate(expression: str) -> str:
         expression: 계산할 수학 표현식 (예: "2 + 3 * 4", "100 / 5")
     """
     try:
-        # 문자열 수식을 실행하여 결과 계산
-        result = eval(expression)
+        # 문자열 수식을 안전하게 계산 (eval 대신 AST 기반 계산기 사용)
+        result = safe_eval(expression)
         return f"결과: {result}"
     except Exception as e:
         # 계산 중 오류 발생 시 메시지 반환
@@ -72,21 +79,31 @@ def calculate(expression: str) -> str:
 # 그래프에서 사용할 도구 리스트
 tools = [get_weather, calculate]
 
+# 한 번의 응답에서 여러 도구를 동시에 요청할지 여부
+# 환경 변수가 없으면 None으로 두고 API에 아예 전달하지 않아 서버(모델)의 기본 동작을 따릅니다.
+_parallel_env = os.getenv("PARALLEL_TOOL_CALLS")
+PARALLEL_TOOL_CALLS = None if _parallel_env is None else _parallel_env.strip().lower() == "true"
+
 # 3. 노드 함수 정의 (Node Functions)
-def call_model(state: AgentState):
-    """
-    LLM을 호출하여 다음 행동을 결정하는 노드입니다.
-    """
-    # 모델 초기화 및 도구 바인딩
+@lru_cache(maxsize=1)  # 모델 초기화와 도구 바인딩은 처음 한 번만 수행합니다.
+def get_model_with_tools():
+    """도구가 연결된 LLM 모델을 반환합니다."""
     model = ChatOpenAI(
         base_url=os.getenv("OPENAI_API_BASE"),
         api_key=os.getenv("OPENAI_API_KEY"),
         model=os.getenv("OPENAI_MODEL")
-    
-    ).bind_tools(tools)
-    
-    # 모델 호출
-    response = model.invoke(state["messages"])
+    )
+    if PARALLEL_TOOL_CALLS is None:
+        return model.bind_tools(tools)
+    return model.bind_tools(tools, parallel_tool_calls=PARALLEL_TOOL_CALLS)
+
+
+def call_model(state: AgentState):
+    """
+    LLM을 호출하여 다음 행동을 결정하는 노드입니다.
+    """
+    # 모델 호출 (도구 바인딩된 모델 재사용)
+    response = get_model_with_tools().invoke(state["messages"])
     
     # 상태 업데이트 결과 반환
     return {"messages": [response]}
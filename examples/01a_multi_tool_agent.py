@@ -21,6 +21,7 @@ Agent를 구현합니다.
 
 import sys                              # 파이썬 시스템 환경을 제어하는 모듈입니다.
 import os                               # 환경변수 접근을 위한 모듈입니다.
+from functools import lru_cache         # 함수 결과를 기억해 두는(캐싱) 도구입니다.
 from pathlib import Path                # 컴퓨터의 파일 경로를 다루기 쉽게 해주는 모듈입니다.
 from typing import Literal              # 특정 텍스트 값만 허용하도록 타입을 정의할 때 씁니다.
 
@@ -44,6 +45,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 
 # 프로젝트 내부 LLM 생성 도우미를 가져옵니다.
 from utils.llm_factory import log_llm_error
+from utils.calculator import safe_eval
 
 
 # =============================================================================
@@ -78,13 +80,9 @@ def calculate(expression: str) -> str:
     수학 표현식(예: 2+3*4)을 계산합니다. 사칙연산과 제곱 등을 지원합니다.
     """
     try:
-        # 보안을 위해 숫자와 사칙연산 기호 등 안전한 문자만 골라냅니다.
-        allowed = set("0123456789+-*/(). ")
-        if not all(c in allowed for c in expression):
-            return "오류: 허락되지 않는 문자가 포함되어 있습니다."
-            
         # 문자열로 된 수식을 계산하여 결과를 뽑아냅니다.
-        result = eval(expression)
+        # (eval 대신 숫자와 산술 기호만 해석하는 안전한 계산기를 사용합니다)
+        result = safe_eval(expression)
         return f"계산 결과: {result}"
     except Exception as e:
         # 계산 중 틀리거나 오류가 나면 그 내용을 알려줍니다.
@@ -145,6 +143,11 @@ def translate(text: str, target_lang: str = "en") -> str:
 # 나중에 AI에게 "자, 네가 쓸 수 있는 도구 목록이야"라고 전달할 때 사용합니다.
 tools = [get_weather, calculate, search_knowledge, get_time, translate]
 
+# 한 번의 응답에서 여러 도구를 동시에 부를 수 있게 할지 정합니다.
+# 로컬 LLM에서는 불안정할 수 있어 기본값은 꺼짐(false)입니다.
+# 켜면 ToolNode가 요청된 도구들을 동시에 실행하므로, 대기 시간이 '합'이 아닌 '가장 느린 도구' 수준이 됩니다.
+PARALLEL_TOOL_CALLS = os.getenv("PARALLEL_TOOL_CALLS", "false").lower() == "true"
+
 
 # =============================================================================
 # 🤖 2. Agent 노드 정의 (AI의 뇌 역할)
@@ -152,8 +155,9 @@ tools = [get_weather, calculate, search_knowledge, get_time, translate]
 # 이 함수는 AI가 질문을 분석하고, 도구를 쓸지 그냥 대답할지 정하는 단계입니다.
 # =============================================================================
 
-def agent_node(state: MessagesState) -> dict:
-    """질문을 받고 무엇을 할지 결정하는 '생각' 노드입니다."""
+@lru_cache(maxsize=1) # 모델 준비는 처음 한 번만 하고, 이후에는 만들어 둔 것을 재사용합니다.
+def get_model_with_tools():
+    """도구 목록이 연결된 AI 모델을 만들어 돌려줍니다."""
     # 1. 사용할 AI 모델을 초기화합니다.
     model = ChatOpenAI(
         base_url=os.getenv("OPENAI_API_BASE"),
@@ -161,20 +165,30 @@ def agent_node(state: MessagesState) -> dict:
         model=os.getenv("OPENAI_MODEL")
     )
     # 2. AI에게 우리가 만든 도구 목록(tools)을 연결해줍니다.
-    # 한번에 여러 도구를 부르지 않도록(parallel_tool_calls=False) 설정합니다.
-    model_with_tools = model.bind_tools(tools, parallel_tool_calls=False)
+    # 한번에 여러 도구를 부를지는 PARALLEL_TOOL_CALLS 설정을 따릅니다.
+    return model.bind_tools(tools, parallel_tool_calls=PARALLEL_TOOL_CALLS)
+
+
+def agent_node(state: MessagesState) -> dict:
+    """질문을 받고 무엇을 할지 결정하는 '생각' 노드입니다."""
+    # 1. 도구가 연결된 AI 모델을 가져옵니다. (처음 호출할 때 한 번만 만들어집니다)
+    model_with_tools = get_model_with_tools()
     
-    # 3. AI의 정체성(페르소나)을 설정하는 기본 지침을 만듭니다.
-    system_message = SystemMessage(content="""당신은 다재다능한 비서입니다.
+    # 2. AI의 정체성(페르소나)을 설정하는 기본 지침을 만듭니다.
+    system_prompt = """당신은 다재다능한 비서입니다.
 - 필요한 도구를 적극적으로 활용해서 질문에 답하세요.
 - 계산이 필요하면 계산기를, 모르는 정보는 검색을, 날씨는 날씨 도구를 쓰세요.
 - 친절하게 한글로 대답해 주세요.
-""")
+"""
+    if PARALLEL_TOOL_CALLS:
+        # 병렬 호출이 켜져 있으면, 서로 상관없는 도구는 한 번에 요청하도록 안내합니다.
+        system_prompt += "- 서로 독립적인 정보가 여러 개 필요하면 필요한 도구를 한 번의 응답에서 모두 호출하세요.\n"
+    system_message = SystemMessage(content=system_prompt)
     
-    # 4. [기본 지침] + [이전까지 나눈 대화들]을 합쳐서 AI에게 전달할 메시지 통을 만듭니다.
+    # 3. [기본 지침] + [이전까지 나눈 대화들]을 합쳐서 AI에게 전달할 메시지 통을 만듭니다.
     messages = [system_message] + state["messages"]
     
-    # 5. AI에게 메시지를 보내고 답변을 받습니다.
+    # 4. AI에게 메시지를 보내고 답변을 받습니다.
     response = model_with_tools.invoke(messages)
     
     # 만약 AI가 도구를 쓰기로 했다면, 무엇을 하려는지 콘솔(검은 창)에 보여줍니다.
@@ -21,6 +21,8 @@
 
 import sys                              # 시스템 환경 제어
 import os                               # 환경변수 접근
+from contextlib import contextmanager   # with 문으로 저장소 연결을 열고 닫기
+from functools import lru_cache         # 함수 결과 캐싱 (모델을 한 번만 준비)
 from pathlib import Path                # 경로 관리
 from typing import Literal              # 특정 텍스트 타입 지정
 
@@ -33,7 +35,7 @@ load_dotenv()
 
 # LangChain 메시지 형식 (사람, 시스템 메시지)
 from langchain_openai import ChatOpenAI # LLM 모델 클래스
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
 # 파이썬 함수를 AI용 도구로 변환
 from langchain_core.tools import tool
 
@@ -44,6 +46,8 @@ from langgraph.checkpoint.memory import MemorySaver  # 대화 내용을 메모
 
 # 프로젝트 공통 유틸리티
 from utils.llm_factory import log_llm_error
+from utils.calculator import safe_eval
+from utils.streaming import StreamPrinter
 
 
 # =============================================================================
@@ -63,10 +67,7 @@ def remember_user_info(info: str) -> str:
 def calculate(expression: str) -> str:
     """수학 계산(예: 10 + 20)을 수행합니다."""
     try:
-        allowed = set("0123456789+-*/(). ") # 안전한 문자 확인
-        if not all(c in allowed for c in expression):
-            return "오류: 허용되지 않은 수식입니다."
-        result = eval(expression)
+        result = safe_eval(expression) # 숫자와 산술 기호만 안전하게 계산
         return f"계산 결과: {result}"
     except Exception as e:
         return f"계산 오류: {e}"
@@ -80,15 +81,21 @@ tools = [remember_user_info, calculate]
 # 🤖 2. Agent 노드 (생각하는 단계)
 # =============================================================================
 
-def agent_node(state: MessagesState) -> dict:
-    """지금까지의 대화(state)를 보고 다음에 할 일을 결정합니다."""
-    # 1. AI 모델을 초기화하고 도구들을 연결합니다.
+@lru_cache(maxsize=1) # 모델 초기화와 도구 연결은 처음 한 번만 수행합니다.
+def get_model_with_tools():
+    """도구들이 연결된 AI 모델을 반환합니다."""
     model = ChatOpenAI(
         base_url=os.getenv("OPENAI_API_BASE"),
         api_key=os.getenv("OPENAI_API_KEY"),
         model=os.getenv("OPENAI_MODEL")
     )
-    model_with_tools = model.bind_tools(tools, parallel_tool_calls=False)
+    return model.bind_tools(tools, parallel_tool_calls=False)
+
+
+def agent_node(state: MessagesState) -> dict:
+    """지금까지의 대화(state)를 보고 다음에 할 일을 결정합니다."""
+    # 1. 도구들이 연결된 AI 모델을 가져옵니다.
+    model_with_tools = get_model_with_tools()
     
     # 2. AI에게 부여할 성격(기억력이 좋은 비서)을 설정합니다.
     system_message = SystemMessage(content="""당신은 대화 내용을 아주 잘 기억하는 친절한 비서입니다.
@@ -111,8 +118,69 @@ def agent_node(state: MessagesState) -> dict:
 # 🗄️ 3. 메모리가 포함된 그래프 구성 (워크플로우 설계)
 # =============================================================================
 
-def create_graph():
-    """메모리 기능이 장착된 에이전트 순서도를 만듭니다."""
+@contextmanager
+def create_checkpointer():
+    """
+    대화 저장소(checkpointer)를 열고, with 블록이 끝나면 연결을 닫습니다.
+    
+    - 기본값: MemorySaver (프로그램이 꺼지면 기억도 사라짐)
+    - AGENT_STATE_DB 환경변수에 파일 경로를 지정하면 SqliteSaver로 디스크에 저장합니다.
+      (pip install langgraph-checkpoint-sqlite 필요, 없으면 MemorySaver 사용)
+    - AGENT_STATE_DB가 postgresql:// 로 시작하면 PostgresSaver로 DB 서버에 저장합니다.
+      (pip install langgraph-checkpoint-postgres 필요, 없으면 MemorySaver 사용)
+    
+    Example:
+        with create_checkpointer() as memory:
+            app = create_graph(memory)
+    """
+    db_path = os.getenv("AGENT_STATE_DB")
+    if not db_path:
+        yield MemorySaver()
+        return
+    
+    if db_path.startswith(("postgresql://", "postgres://")):
+        with _open_postgres_checkpointer(db_path) as saver:
+            yield saver
+        return
+    
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite가 설치되지 않아 메모리 저장소를 사용합니다.")
+        yield MemorySaver()
+        return
+    
+    print(f"💾 대화 기록을 파일에 저장합니다: {db_path}")
+    # from_conn_string은 with 블록이 끝날 때 SQLite 연결을 닫아 줍니다.
+    with SqliteSaver.from_conn_string(db_path) as saver:
+        yield saver
+
+
+@contextmanager
+def _open_postgres_checkpointer(dsn: str):
+    """PostgreSQL에 대화 기록을 저장하는 checkpointer를 열고, 끝나면 연결을 닫습니다."""
+    try:
+        from langgraph.checkpoint.postgres import PostgresSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-postgres가 설치되지 않아 메모리 저장소를 사용합니다.")
+        yield MemorySaver()
+        return
+    
+    print("💾 대화 기록을 PostgreSQL에 저장합니다.")
+    # from_conn_string은 autocommit/dict_row로 연결하고, with 블록이 끝날 때 연결을 닫아 줍니다.
+    with PostgresSaver.from_conn_string(dsn) as saver:
+        # 처음 한 번 저장용 테이블과 인덱스를 만듭니다. (이미 있으면 그대로 둡니다)
+        saver.setup()
+        yield saver
+
+
+def create_graph(memory=None):
+    """
+    메모리 기능이 장착된 에이전트 순서도를 만듭니다.
+    
+    Args:
+        memory: create_checkpointer()로 연 대화 저장소 (없으면 MemorySaver 사용)
+    """
     # 1. 흐름도 그릴 캔버스(StateGraph) 준비
     builder = StateGraph(MessagesState)
     
@@ -132,9 +200,11 @@ def create_graph():
     # 5. 도구를 썼으면 다시 '생각(agent)'으로 돌아오게 합니다.
     builder.add_edge("tools", "agent")
     
-    # 6. ⭐ 가장 중요한 부분: 대화 저장소(MemorySaver) 만들기
+    # 6. ⭐ 가장 중요한 부분: 대화 저장소(MemorySaver)
     # 이 객체가 프로그램이 켜져 있는 동안 대화 내용을 기억해줍니다.
-    memory = MemorySaver()
+    # (AGENT_STATE_DB를 설정하면 파일(SQLite)에 저장하여 프로그램을 껐다 켜도 기억합니다)
+    if memory is None:
+        memory = MemorySaver()
     
     # 7. 그래프를 완성(컴파일)할 때 이 저장소를 'checkpointer'로 전달합니다.
     # 이제 이 그래프는 대화방 ID를 통해 서로 다른 대화를 구분해서 기억할 수 있습니다.
@@ -156,14 +226,19 @@ def run_chat(app, thread_id: str, query: str):
     
     try:
         # 2. 질문과 설정을 담아 그래프를 실행합니다.
-        result = app.invoke(
-            {"messages": [HumanMessage(content=query)]},
-            config=config # 여기서 대화방 정보를 넘깁니다.
-        )
-        
-        # 3. 마지막 대답을 화면에 출력합니다.
-        final_answer = result["messages"][-1].content
-        print(f"🤖 AI: {final_answer}")
+        # stream_mode="messages"로 실행하면 AI가 만드는 글자 조각(토큰)을 생기는 즉시 받을 수 있어,
+        # 전체 답변이 끝날 때까지 기다리지 않고 바로 화면에 보여줄 수 있습니다.
+        print("🤖 AI: ", end="", flush=True)
+        with StreamPrinter() as out: # 글자 조각을 조금씩 모아서 한 번에 출력합니다.
+            for chunk, metadata in app.stream(
+                {"messages": [HumanMessage(content=query)]},
+                config=config, # 여기서 대화방 정보를 넘깁니다.
+                stream_mode="messages",
+            ):
+                # 3. '생각(agent)' 단계에서 나온 AI의 글자만 이어서 출력합니다. (도구 결과는 제외)
+                if metadata.get("langgraph_node") == "agent" and isinstance(chunk, AIMessageChunk):
+                    out.write(chunk.content)
+        print()
         
     except Exception as e:
         log_llm_error(e)
@@ -180,37 +255,44 @@ if __name__ == "__main__":
     print("- '/thread 방이름' : 대화방을 바꿉니다 (예: /thread room2)")
     print("- 'q', 'exit' : 프로그램을 종료합니다.\n")
     
-    # 1. 기억 기능이 있는 에이전트를 생성합니다.
-    app = create_graph()
+    # 1. 대화 저장소를 열고, 기억 기능이 있는 에이전트를 생성합니다.
+    # with 블록을 벗어나면(종료/오류 모두) 저장소의 DB 연결이 닫힙니다.
+    with create_checkpointer() as memory:
+        app = create_graph(memory)
+        # MemorySaver가 아니면 대화 기록이 파일/DB에 남아 다음 실행 때도 이어집니다.
+        persistent = not isinstance(memory, MemorySaver)
     
-    # 2. 처음 사용할 기본 대화방 ID를 정합니다.
-    current_thread = "main_room"
+        # 2. 처음 사용할 기본 대화방 ID를 정합니다.
+        current_thread = "main_room"
     
-    while True:
-        try:
-            # 질문 입력 받기
-            user_input = input(f"🙋 [현위치: {current_thread}] : ").strip()
+        while True:
+            try:
+                # 질문 입력 받기
+                user_input = input(f"🙋 [현위치: {current_thread}] : ").strip()
             
-            if not user_input: continue
+                if not user_input: continue
                 
-            # 'q' 등을 입력하면 종료
-            if user_input.lower() in ("quit", "exit", "q"):
-                print("👋 대화 기록을 지우고 종료합니다. 다음에 봐요!")
-                break
+                # 'q' 등을 입력하면 종료
+                if user_input.lower() in ("quit", "exit", "q"):
+                    if persistent:
+                        print("👋 대화 기록은 저장소에 남겨 두고 종료합니다. 다음에 봐요!")
+                    else:
+                        print("👋 대화 기록을 지우고 종료합니다. 다음에 봐요!")
+                    break
             
-            # 대화방을 바꾸고 싶을 때 (/thread 이름 입력)
-            if user_input.startswith("/thread "):
-                new_thread = user_input.split(" ")[1]
-                print(f"🔄 대화방을 '{new_thread}'로 이동했습니다. 이전 기억은 거기 남아있습니다.")
-                current_thread = new_thread
-                continue
-
-            # 입력한 방 ID와 질문으로 대화를 실행합니다.
-            run_chat(app, current_thread, user_input)
+                # 대화방을 바꾸고 싶을 때 (/thread 이름 입력)
+                if user_input.startswith("/thread "):
+                    new_thread = user_input.split(" ")[1]
+                    print(f"🔄 대화방을 '{new_thread}'로 이동했습니다. 이전 기억은 거기 남아있습니다.")
+                    current_thread = new_thread
+                    continue
+
+                # 입력한 방 ID와 질문으로 대화를 실행합니다.
+                run_chat(app, current_thread, user_input)
             
-        except KeyboardInterrupt:
-            print("\n👋 프로그램을 종료합니다.")
-            break
-        except Exception as e:
-            print(f"\n⚠️ 시스템 오류 발생: {e}")
-            break
+            except KeyboardInterrupt:
+                print("\n👋 프로그램을 종료합니다.")
+                break
+            except Exception as e:
+                print(f"\n⚠️ 시스템 오류 발생: {e}")
+                break
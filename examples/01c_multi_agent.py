@@ -20,7 +20,7 @@
 # =============================================================================
 
 import sys                              # 시스템 환경 제어용
-import os                               # 환경변수 접근용
+import re                               # 정규표현식 (담당자 이름 찾기)
 from pathlib import Path                # 파일 경로 처리용
 from typing import TypedDict, Literal, List  # 결과물 형식 정의용
 
@@ -32,7 +32,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # LangChain 메시지 형식과 프롬프트 템플릿(지시서 양식)
-from langchain_openai import ChatOpenAI # LLM 모델 클래스
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -40,7 +39,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import StateGraph, START, END
 
 # 프로젝트 유틸리티
-from utils.llm_factory import log_llm_error
+from utils.llm_factory import get_llm, log_llm_error
+
+
+# 팀원 모두가 함께 쓰는 AI 모델 (프로그램 시작 시 한 번만 만들고 재사용합니다)
+_llm = get_llm()
 
 
 # =============================================================================
@@ -65,19 +68,21 @@ class MultiAgentState(TypedDict):
 # 🤖 2. 전문 멤버(Agent) 노드 정의하기
 # =============================================================================
 
+# 팀장 답변에서 담당자를 찾는 정규식(한 번만 컴파일)과 정식 이름 - 위에서부터 순서대로 확인합니다.
+_AGENT_PATTERNS = [
+    (re.compile(r"\bresearch"), "researcher"),
+    (re.compile(r"\banaly"), "analyst"),
+    (re.compile(r"\bwrite"), "writer"),
+    (re.compile(r"\bdone"), "done"),
+]
+
+
 def supervisor_node(state: MultiAgentState) -> dict:
     """
     [팀장] Supervisor: 팀원들의 진행 상황을 보고 다음 순서를 결정합니다.
     """
     print("\n🎯 [Supervisor] 업무 상황 체크 중... 다음엔 누구를 투입할까요?")
     
-    # AI 모델 초기화
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
     # 팀장에게 주는 지침 메모입니다.
     prompt = ChatPromptTemplate.from_messages([
         ("system", """당신은 팀의 관리자(PM)입니다.
@@ -98,7 +103,7 @@ def supervisor_node(state: MultiAgentState) -> dict:
     ])
     
     # AI팀장이 상황을 보고 다음 담당자 이름을 말합니다.
-    response = (prompt | model).invoke({
+    response = (prompt | _llm).invoke({
         "task": state["task"],
         "research_result": state.get("research_result") or "시작 전",
         "analysis_result": state.get("analysis_result") or "시작 전",
@@ -109,10 +114,11 @@ def supervisor_node(state: MultiAgentState) -> dict:
     next_agent = response.content.lower().strip().replace('"', '').replace('.', '')
     
     # 안전 장치: 단어에 오타가 있더라도 정확한 이름으로 맞춰줍니다.
-    if "research" in next_agent: next_agent = "researcher"
-    elif "analy" in next_agent: next_agent = "analyst"
-    elif "write" in next_agent: next_agent = "writer"
-    elif "done" in next_agent: next_agent = "done"
+    # (여러 담당자가 언급되면 researcher → analyst → writer → done 순서로 먼저 맞는 쪽을 고릅니다)
+    for pattern, name in _AGENT_PATTERNS:
+        if pattern.search(next_agent):
+            next_agent = name
+            break
     
     print(f"   → 결정: 다음 업무는 '{next_agent}'님에게 맡깁니다.")
     
@@ -129,18 +135,13 @@ def researcher_node(state: MultiAgentState) -> dict:
     """
     print("\n🔬 [Researcher] 관련 정보를 열심히 조사하고 있습니다...")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
     prompt = ChatPromptTemplate.from_messages([
         ("system", "당신은 탐사 보도 전문 리서처입니다. 주제에 대해 구체적인 사실 관계를 풍부하게 조사하세요."),
         ("human", "주제: {task}"),
     ])
     
     # AI가 조사를 수행합니다.
-    response = (prompt | model).invoke({"task": state["task"]})
+    response = (prompt | _llm).invoke({"task": state["task"]})
     
     # 조사한 내용을 'research_result' 칸에 적어 놓습니다.
     return {
@@ -155,18 +156,13 @@ def analyst_node(state: MultiAgentState) -> dict:
     """
     print("\n📊 [Analyst] 수집된 자료를 바탕으로 심층 분석을 시작합니다...")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
     prompt = ChatPromptTemplate.from_messages([
         ("system", "당신은 냉철한 데이터 분석가입니다. 리서치 결과를 토대로 장점, 단점, 앞으로의 전망을 분석하세요."),
         ("human", "리서치 내용:\n{research_result}"),
     ])
     
     # 리서치 결과를 보고 분석합니다.
-    response = (prompt | model).invoke({"research_result": state["research_result"]})
+    response = (prompt | _llm).invoke({"research_result": state["research_result"]})
     
     # 분석 결과를 'analysis_result' 칸에 적습니다.
     return {
@@ -181,18 +177,13 @@ def writer_node(state: MultiAgentState) -> dict:
     """
     print("\n✍️ [Writer] 모든 자료를 종합하여 최종 결과물을 작성하고 있습니다...")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
     prompt = ChatPromptTemplate.from_messages([
         ("system", "당신은 전문 작가입니다. 리서치와 분석 데이터를 활용해 가독성 좋은 보고서나 깔끔한 요약본을 작성하세요."),
         ("human", "재료:\n- 조사 정보: {research_result}\n- 전문 분석: {analysis_result}"),
     ])
     
     # 모든 재료를 모아서 글을 씁니다.
-    response = (prompt | model).invoke({
+    response = (prompt | _llm).invoke({
         "research_result": state["research_result"],
         "analysis_result": state["analysis_result"]
     })
@@ -209,13 +200,23 @@ def writer_node(state: MultiAgentState) -> dict:
 # 🔀 3. 길잡이(라우터) 함수
 # =============================================================================
 
+# 신호등이 돌려주는 이름 → 실제로 이동할 노드 (한 번만 만들어 두고 그래프 조립 때 그대로 씁니다)
+_ROUTE_MAP = {
+    "researcher": "researcher",
+    "analyst": "analyst",
+    "writer": "writer",
+    "done": END,        # "다 끝났다"고 하면 마침표(END)를 찍습니다.
+}
+_ALLOWED_ROUTES = frozenset(_ROUTE_MAP)
+
+
 def route_by_supervisor(state: MultiAgentState) -> Literal["researcher", "analyst", "writer", "done"]:
     """팀장이 말한 다음 담당자 노드로 길을 안내해주는 신호등 역할입니다."""
     # 팀장이 current_agent 칸에 적어놓은 이름을 확인합니다.
     next_agent = state.get("current_agent", "done")
     
     # 그 이름이 목록에 있는 이름이면 그리로 보내고, 없으면 종료시킵니다.
-    if next_agent in ["researcher", "analyst", "writer", "done"]:
+    if next_agent in _ALLOWED_ROUTES:
         return next_agent
     
     return "done"
@@ -243,12 +244,7 @@ def create_graph():
     builder.add_conditional_edges(
         "supervisor",          # 팀장 단계가 끝나면
         route_by_supervisor,   # 신호등(라우터)이 길을 묻습니다.
-        {
-            "researcher": "researcher",
-            "analyst": "analyst",
-            "writer": "writer",
-            "done": END        # "다 끝났다"고 하면 마침표(END)를 찍습니다.
-        }
+        _ROUTE_MAP,            # 담당자 이름별 이동할 노드 표
     )
     
     # 4. 업무를 마친 멤버는 다시 팀장에게 보고하러 돌아옵니다 (화살표).
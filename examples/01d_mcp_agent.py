@@ -181,6 +181,8 @@ async def create_mcp_agent(server_configs: dict):
     
     # MCP 서버에서 제공하는 모든 도구 가져오기
     # get_tools()는 연결된 모든 서버의 도구를 LangChain Tool 형태로 반환합니다.
+    # 서버별 세션을 한 번 열어 두고 재사용하므로, 도구를 부를 때마다 서버를 다시 띄우거나
+    # 핸드셰이크를 반복하지 않습니다. (세션은 manager.disconnect()에서 닫힙니다)
     tools = await manager.get_tools()
     
     # 연결 정보 출력
@@ -285,18 +287,14 @@ async def run_interactive_mcp_agent(server_configs: dict = None):
                         if messages:
                             last_msg = messages[-1]
                             
-                            # 도구 호출 로깅
-                            if hasattr(last_msg, 'tool_calls') and last_msg.tool_calls:
+                            # 도구 호출 로깅 (tool_calls가 없는 메시지는 None으로 처리)
+                            tool_calls = getattr(last_msg, 'tool_calls', None)
+                            if tool_calls:
                                 step_count += 1
                                 print(f"\n\n🔧 [Step {step_count}] 도구 호출:")
-                                for tool_call in last_msg.tool_calls:
+                                for tool_call in tool_calls:
                                     print(f"  📌 {tool_call.get('name')}: {tool_call.get('args')}")
                                 print("  ⏳ 실행 중...", end="", flush=True)
-                            
-                            # 도구 결과 로깅
-                            elif hasattr(last_msg, 'content') and last_msg.content and len(messages) > len(current_messages):
-                                # AI의 중간 응답이나 최종 응답이 아닐 때 (즉, ToolMessage 바로 다음이 아닌 경우 등)
-                                pass
 
                         final_response_chunk = chunk
 
@@ -305,7 +303,7 @@ async def run_interactive_mcp_agent(server_configs: dict = None):
                     final_messages = final_response_chunk["messages"]
                     last_msg = final_messages[-1]
                     
-                    if hasattr(last_msg, 'content') and last_msg.content:
+                    if getattr(last_msg, 'content', None):
                         print(f"\n\n🤖 Agent:\n{last_msg.content}\n")
                     
                     # 대화 기록 업데이트 (전체 히스토리 덮어쓰기)
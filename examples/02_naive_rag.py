@@ -36,6 +36,7 @@ StateGraph를 활용하여 검색 결과와 생성된 답변을 상태로 관리
 
 # Python 표준 라이브러리
 import sys                              # 시스템 경로 조작용
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 파일 경로를 객체지향적으로 다루는 라이브러리
 from typing import TypedDict, List, Annotated  
 # - TypedDict: 딕셔너리의 키와 값 타입을 정의하는 타입 힌트
@@ -120,6 +121,7 @@ class RAGState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_naive_vs() -> VectorStoreManager:
     """Naive RAG 전용 지식 창고를 만들고 데이터를 로드합니다."""
     return get_rag_vector_store(collection_name="rag_collection")
@@ -21,6 +21,7 @@
 
 import sys                              # 시스템 관련 도구
 import os                               # 환경변수 접근 도구
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 경로 계산 도구
 from typing import TypedDict, List      # 데이터 형식 정의용
 
@@ -64,6 +65,7 @@ class RerankRAGState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_rerank_vs() -> VectorStoreManager:
     """Rerank 전용 지식 창고를 만들고 데이터를 로드합니다."""
     return get_rag_vector_store(collection_name="rag_collection")
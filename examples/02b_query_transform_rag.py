@@ -21,6 +21,7 @@
 
 import sys                              # 시스템 환경 제어
 import os                               # 환경변수 접근용
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 파일 경로 처리
 from typing import TypedDict, List      # 데이터 형식 정의
 
@@ -41,7 +42,7 @@ from langgraph.graph import StateGraph, START, END
 
 # 프로젝트 전용 유틸리티들
 from utils.llm_factory import get_embeddings, log_llm_error
-from utils.vector_store import VectorStoreManager
+from utils.vector_store import VectorStoreManager, dedupe_documents
 
 
 # =============================================================================
@@ -66,6 +67,7 @@ class QueryTransformState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_qt_vs() -> VectorStoreManager:
     """검색 변환 전용 지식 창고를 생성하고 데이터를 로드합니다."""
     return get_rag_vector_store(collection_name="rag_collection")
@@ -142,34 +144,22 @@ def search_with_multi_queries(state: QueryTransformState) -> dict:
     vs = get_qt_vs()
     
     all_docs = []
-    seen_content = set() # 중복된 내용을 걸러내기 위한 장치
     
     # 각 질문마다 돌아가며 검색합니다.
     for q in state["multi_queries"]:
-        docs = vs.search(query=q, k=2)
-        for d in docs:
-            # 이미 찾은 내용이 아니면 목록에 담습니다.
-            if d.page_content not in seen_content:
-                all_docs.append(d)
-                seen_content.add(d.page_content)
-                
-    return {"multi_query_results": all_docs}
+        all_docs.extend(vs.search(query=q, k=2))
+    
+    # 이미 찾은 내용은 걸러냅니다. (내용 해시로 비교)
+    return {"multi_query_results": dedupe_documents(all_docs)}
 
 
 def merge_results(state: QueryTransformState) -> dict:
     """[통합 단계] 두 경로(A, B)에서 얻은 문서들을 하나로 예쁘게 합치기"""
     print(f"\n🔀 [결과 합치기] 모든 검색 경로의 결과를 통합하고 중복을 제거합니다.")
     
-    seen = set()
-    merged = []
-    
-    # HyDE 검색 결과와 Multi-Query 검색 결과를 한 통에 담습니다.
+    # HyDE 검색 결과와 Multi-Query 검색 결과를 한 통에 담고, 중복을 걸러냅니다.
     total_docs = state.get("hyde_results", []) + state.get("multi_query_results", [])
-    
-    for doc in total_docs:
-        if doc.page_content not in seen:
-            merged.append(doc)
-            seen.add(doc.page_content)
+    merged = dedupe_documents(total_docs)
     
     # 너무 복잡하면 상위 5개만 최종 후보로 정합니다.
     final_docs = merged[:5]
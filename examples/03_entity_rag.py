@@ -36,6 +36,7 @@ LangGraph의 병렬 실행(Parallel Execution) 기능을 활용하여,
 # Python 표준 라이브러리
 import sys                              # 시스템 경로 조작용
 import os                               # 환경변수 접근용
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 파일 경로를 객체지향적으로 다루는 라이브러리
 from typing import TypedDict, List      # 타입 힌트용
 
@@ -76,7 +77,7 @@ from langgraph.graph import StateGraph, START, END
 from utils.llm_factory import get_embeddings, log_llm_error
 # LLM 및 임베딩 모델 생성
 
-from utils.vector_store import VectorStoreManager
+from utils.vector_store import VectorStoreManager, dedupe_documents
 # 벡터 DB 관리
 
 
@@ -117,6 +118,7 @@ class EntityRAGState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_vector_store() -> VectorStoreManager:
     """Vector Store 초기화 및 데이터 로드"""
     return get_rag_vector_store(collection_name="rag_collection")
@@ -233,18 +235,11 @@ def merge_results(state: EntityRAGState):
     """
     print("🔄 검색 결과 병합 중...")
     
-    # 중복 제거를 위한 집합
-    seen = set()
-    merged = []
-    
     # 엔티티 검색 결과 우선 추가
     all_docs = state.get("entity_docs", []) + state.get("semantic_docs", [])
     
-    for doc in all_docs:
-        # page_content를 기준으로 중복 체크
-        if doc.page_content not in seen:
-            merged.append(doc)
-            seen.add(doc.page_content)
+    # page_content의 해시(16바이트)를 기준으로 중복 제거 (순서 유지)
+    merged = dedupe_documents(all_docs)
 
     print(f"   → 총 {len(merged)}개 문서 병합됨")
     
@@ -41,6 +41,7 @@ Self-RAG의 개념을 도입하여, 검색된 문서의 관련성을 평가하
 # Python 표준 라이브러리
 import sys                              # 시스템 경로 조작용
 import os                               # 환경변수 접근용
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 파일 경로 처리
 from typing import TypedDict, List, Literal  
 # Literal: 특정 값만 허용하는 타입 (예: Literal["yes", "no"])
@@ -63,8 +64,8 @@ from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 # ChatPromptTemplate: 평가/변환용 프롬프트 템플릿
 
-from langchain_core.output_parsers import JsonOutputParser
-# JsonOutputParser: 구조화된 평가 결과 파싱
+from pydantic import BaseModel, Field
+# BaseModel: 구조화된 평가 결과 양식 (AI가 정해진 형식으로만 답하도록)
 
 # -----------------------------------------------------------------------------
 # 🔗 LangGraph 핵심 모듈 임포트
@@ -117,6 +118,7 @@ class AdvancedRAGState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_vector_store() -> VectorStoreManager:
     """Vector Store 초기화 및 데이터 로드"""
     return get_rag_vector_store(collection_name="rag_collection")
@@ -145,6 +147,11 @@ def retrieve(state: AdvancedRAGState):
     return {"documents": docs}
 
 
+class Grade(BaseModel):
+    """문서 평가 결과 양식"""
+    relevant: bool = Field(description="문서가 질문과 관련이 있으면 true")
+
+
 def grade_documents(state: AdvancedRAGState):
     """
     문서 관련성 평가 노드 (Grading)
@@ -168,25 +175,31 @@ def grade_documents(state: AdvancedRAGState):
     # 평가용 프롬프트
     prompt = ChatPromptTemplate.from_template(
         """당신은 문서 평가자입니다. 다음 문서가 사용자의 질문과 관련이 있는지 평가하세요.
-        관련이 있다면 'yes', 없다면 'no'라고만 답하세요.
 
         질문: {question}
         문서: {document}
         """
     )
     
-    chain = prompt | model
+    # 구조화된 출력: 답을 Grade 양식(relevant: true/false)으로 바로 받습니다.
+    chain = prompt | model.with_structured_output(Grade)
     
     # 각 문서를 평가하여 하나라도 관련 있으면 relevant
     is_relevant = False
     for i, doc in enumerate(state["documents"]):
-        res = chain.invoke({
-            "question": state["question"], 
-            "document": doc.page_content
-        })
+        try:
+            res = chain.invoke({
+                "question": state["question"], 
+                "document": doc.page_content
+            })
+            # 구조화 출력이 None을 돌려주는 경우도 읽지 못한 결과로 처리합니다.
+            relevant = bool(res.relevant)
+        except Exception as e:
+            # 로컬 LLM이 양식에 맞지 않는 답을 주면, 전체 실행을 멈추지 않고 이 문서만 '관련 없음'으로 처리
+            print(f"   → 문서 {i+1}: 평가 결과를 읽지 못해 관련 없음으로 처리 ({type(e).__name__})")
+            continue
         
-        # 응답에서 yes/no 판단
-        if "yes" in res.content.lower():
+        if relevant:
             print(f"   → 문서 {i+1}: 관련 있음 ✓")
             is_relevant = True
             break  # 하나라도 관련 있으면 충분
@@ -20,7 +20,8 @@
 # =============================================================================
 
 import sys                              # 시스템 환경 제어
-import os                               # 환경변수 접근용
+import re                               # 난이도 응답 정규화용 정규식
+from functools import lru_cache         # 함수 결과 캐싱 (한 번 만든 객체 재사용)
 from pathlib import Path                # 파일 경로 처리
 from typing import TypedDict, List, Literal  # 데이터 형식 및 리터럴 타입 정의
 
@@ -32,16 +33,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # LangChain 문서 형식 및 프롬프트 도구
-from langchain_openai import ChatOpenAI # LLM 모델 클래스
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field, field_validator   # AI 답변 양식(구조화된 출력) 정의
 
 # LangGraph 순서도(그래프) 제작 도구
 from langgraph.graph import StateGraph, START, END
 
 # 프로젝트 전용 유틸리티
-from utils.llm_factory import get_embeddings, log_llm_error
-from utils.vector_store import VectorStoreManager
+from utils.llm_factory import get_embeddings, get_llm, log_llm_error
+from utils.vector_store import VectorStoreManager, dedupe_documents
+from utils.streaming import StreamPrinter
 
 
 # =============================================================================
@@ -64,44 +66,114 @@ class AdaptiveRAGState(TypedDict):
 
 from utils.data_loader import get_rag_vector_store
 
+@lru_cache(maxsize=1)
 def get_adaptive_vs() -> VectorStoreManager:
     """적응형 RAG를 위한 Vector Store를 준비합니다."""
     return get_rag_vector_store(collection_name="rag_collection")
 
 
+# 모든 노드가 함께 쓰는 AI 모델 (한 번만 만들어서 연결(커넥션 풀)을 재사용합니다)
+_llm = get_llm()
+
+
+def _stream_answer(prompt) -> str:
+    """AI의 답변을 글자가 만들어지는 즉시 화면에 보여주고, 완성된 답변 문자열을 돌려줍니다."""
+    print("\n🤖 AI의 답변:")
+    chunks = []
+    # 글자 조각을 조금씩 모아서 출력합니다. (조각마다 화면에 쓰면 콘솔이 느려질 수 있음)
+    with StreamPrinter() as out:
+        for chunk in _llm.stream(prompt):
+            out.write(chunk.content)
+            chunks.append(chunk.content)
+    print()
+    return "".join(chunks)
+
+
 # =============================================================================
 # 🧠 3. 관문 노드: 질문의 난이도 판별 (Classification)
 # =============================================================================
 
+# LLM이 돌려준 난이도 문자열에서 세 단어 중 하나를 찾는 정규식 (모듈 로드 시 한 번만 컴파일)
+# 앞에 붙은 부정어("not complex", "isn't simple")도 함께 잡아서 부정된 단어는 건너뜁니다.
+_COMPLEXITY_RE = re.compile(r"(\bnot\s+|n't\s+)?\b(simple|moderate|complex)\b")
+
+
+def _parse_complexity(text) -> str:
+    """
+    난이도 문자열에서 부정되지 않은 첫 번째 난이도 단어를 돌려줍니다. (없으면 moderate)
+    
+    Example:
+        >>> _parse_complexity("not complex, this is simple")
+        'simple'
+        >>> _parse_complexity("Moderate.")
+        'moderate'
+    """
+    for match in _COMPLEXITY_RE.finditer(str(text).lower()):
+        if not match.group(1):
+            return match.group(2)
+    return "moderate"
+
+
+class QueryAnalysis(BaseModel):
+    """판별사 AI가 채워서 돌려줄 답안지 양식입니다."""
+    # Literal로 고를 수 있는 값을 알려 주고, 로컬 모델이 "Moderate"처럼 조금 다르게 답해도
+    # 아래 검사기가 세 단어 중 하나로 맞춰 줍니다.
+    complexity: Literal["simple", "moderate", "complex"] = Field(description="질문 난이도")
+    direct_answer: str = Field(
+        default="",
+        description='complexity가 "simple"이면 질문에 대한 답변, 아니면 빈 문자열',
+    )
+
+    @field_validator("complexity", mode="before")
+    @classmethod
+    def _normalize_complexity(cls, value):
+        # "Moderate", "complex." 등 표기가 조금 달라도 세 단어 중 하나로 맞추고, 없으면 moderate
+        return _parse_complexity(value)
+
+
 def classify_query_node(state: AdaptiveRAGState) -> dict:
-    """[판별 단계] 질문을 읽고 '쉬움/보통/어려움' 중 하나로 분류합니다."""
+    """
+    [판별 단계] 질문을 읽고 '쉬움/보통/어려움' 중 하나로 분류합니다.
+    
+    쉬운 질문이면 같은 호출 안에서 답변까지 받아 오므로,
+    simple 경로는 AI를 한 번만 부르고 끝납니다.
+    """
     print(f"\n🧐 [분류] 질문의 수준을 분석 중입니다... 어떤 전략이 좋을까요?")
     
-    # AI 모델 초기화
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    # 심사위원 AI에게 질문의 난이도를 판단해달라고 지시합니다.
+    # 심사위원 AI에게 질문의 난이도를 판단하고, 쉬우면 바로 답해달라고 지시합니다.
     prompt = ChatPromptTemplate.from_messages([
-        ("system", """당신은 질문 분석 전문가입니다. 다음 3가지 중 하나로만 대답하세요.
+        ("system", """당신은 질문 분석 전문가입니다. 질문의 난이도(complexity)를 다음 3가지 중 하나로 고르세요.
 1. "simple": 인사, 이름 묻기, 혹은 아주 뻔한 상식 질문
 2. "moderate": 지식 창고 검색이 한 번쯤 필요한 일반적인 질문
 3. "complex": 여러 관점의 분석, 비교, 깊은 사고가 필요한 복잡한 질문
-오직 영문 단어 하나("simple", "moderate", "complex")만 답변하세요."""),
+"simple"인 경우에만 direct_answer에 질문에 대한 답변을 한국어로 작성하고, 나머지는 빈 문자열로 두세요."""),
         ("human", "사용자 질문: {question}"),
     ])
     
-    response = (prompt | model).invoke({"question": state["question"]})
-    # AI의 답변을 소문자로 바꾸고 공백을 제거합니다.
-    complexity = response.content.lower().strip()
-    
-    # 만약 AI가 이상한 말을 하면 기본값으로 '보통(moderate)'을 지정합니다.
-    if complexity not in ["simple", "moderate", "complex"]:
-        complexity = "moderate"
+    try:
+        # 구조화된 출력: AI의 답을 QueryAnalysis 양식으로 바로 받아옵니다.
+        result = (prompt | _llm.with_structured_output(QueryAnalysis)).invoke(
+            {"question": state["question"]}
+        )
+        complexity = result.complexity
+        direct_answer = result.direct_answer.strip()
+    except Exception as e:
+        # 만약 AI의 답을 읽지 못하면 기본값으로 '보통(moderate)'을 지정합니다.
+        print(f"   → 분석 결과를 읽지 못했습니다: {e}")
+        complexity, direct_answer = "moderate", ""
         
     print(f"   → 판단 결과: 이 질문은 '{complexity}' 수준입니다.")
+    
+    # 쉬운 질문이고 답변도 이미 받았다면, 여기서 바로 답변까지 기록합니다.
+    if complexity == "simple" and direct_answer:
+        print("⚡ [Simple] 분류하면서 받은 답변을 바로 사용합니다.")
+        print(f"\n🤖 AI의 답변:\n{direct_answer}")
+        return {
+            "query_complexity": complexity,
+            "strategy_used": "Simple (분류와 동시에 답변)",
+            "answer": direct_answer,
+        }
+    
     # 판단 결과를 기록합니다.
     return {"query_complexity": complexity}
 
@@ -113,13 +185,15 @@ def classify_query_node(state: AdaptiveRAGState) -> dict:
 def simple_strategy_node(state: AdaptiveRAGState) -> dict:
     """[전략 1: 쉬운 질문] 검색 없이 AI 본인의 상식으로 바로 답합니다."""
     print("⚡ [Simple] 너무 쉬운 질문이라 검색 없이 바로 대답합니다.")
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    res = model.invoke(state["question"])
-    return {"strategy_used": "Simple (직접 답변)", "answer": res.content}
+    answer = _stream_answer(state["question"])
+    return {"strategy_used": "Simple (직접 답변)", "answer": answer}
+
+
+# 보통 질문용 프롬프트: 고정된 지시문(system)이 앞, 바뀌는 내용(human)이 뒤에 옵니다.
+_MODERATE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "당신은 친절한 AI 도우미입니다. 주어진 지식 내용을 참고하여 질문에 정확하게 답하세요."),
+    ("human", "지식 내용:\n{context}\n\n질문: {question}"),
+])
 
 
 def moderate_strategy_node(state: AdaptiveRAGState) -> dict:
@@ -131,50 +205,40 @@ def moderate_strategy_node(state: AdaptiveRAGState) -> dict:
     
     # 찾은 자료들을 한데 묶습니다.
     context = "\n".join([d.page_content for d in docs])
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    # 찾은 자료와 함께 질문을 던져 답변을 받습니다.
-    res = model.invoke(f"지식 내용:\n{context}\n\n질문: {state['question']}")
+    # 찾은 자료와 함께 질문을 던져 답변을 받습니다. (실시간 출력)
+    # 매번 바뀌는 자료/질문은 human 메시지에 넣어 system 부분(앞부분)이 항상 같게 유지합니다.
+    # → 서버의 프롬프트 접두사(prefix) 캐시가 적중하기 쉬워집니다.
+    prompt = _MODERATE_PROMPT.invoke({"context": context, "question": state["question"]})
+    answer = _stream_answer(prompt)
     
     return {
         "strategy_used": "Moderate (일반 RAG)", 
         "documents": docs, 
-        "answer": res.content
+        "answer": answer
     }
 
 
 def complex_strategy_node(state: AdaptiveRAGState) -> dict:
     """[전략 3: 어려운 질문] 질문을 쪼개서 깊게 조사하고 분석 보고서를 씁니다."""
     print("🔬 [Complex] 질문이 복잡하네요! 여러 단계로 나눠서 정밀 분석합니다.")
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
     # 1. 어려운 질문을 해결하기 위한 2개의 세부 질문을 AI에게 먼저 물어봅니다.
-    decompose_res = model.invoke(f"이 어려운 질문을 해결하기 위해 먼저 알아야 할 기초 질문 2개만 뽑아주세요. 한 줄씩 쓰세요.\n질문: {state['question']}")
+    decompose_res = _llm.invoke(f"이 어려운 질문을 해결하기 위해 먼저 알아야 할 기초 질문 2개만 뽑아주세요. 한 줄씩 쓰세요.\n질문: {state['question']}")
     sub_queries = [q.strip() for q in decompose_res.content.split("\n") if q.strip()][:2]
     
     print(f"   → 단계별 세부 조사 항목: {sub_queries}")
     
-    # 2. 세부 질문들로 각각 지식 창고를 뒤집니다.
+    # 2. 세부 질문들을 한꺼번에(배치로) 지식 창고에 물어봅니다. (임베딩/DB 왕복 1번)
     vs = get_adaptive_vs()
-    all_context = []
-    for sq in sub_queries + [state["question"]]:
-        docs = vs.search(sq, k=2)
-        all_context.extend([d.page_content for d in docs])
+    results = vs.search_batch(sub_queries + [state["question"]], k=2)
     
-    # 3. 모은 모든 정보를 합쳐서(중복 제거) 심층 보고서 형태의 답변을 생성합니다.
-    final_context = "\n".join(list(set(all_context)))
-    res = model.invoke(f"심층 분석 답변 요청:\n관련된 모든 정보:\n{final_context}\n\n최종 질문: {state['question']}")
+    # 3. 모은 모든 정보를 내용 해시 기준으로 중복 제거한 뒤 심층 보고서 형태의 답변을 생성합니다.
+    unique_docs = dedupe_documents([d for group in results for d in group])
+    final_context = "\n".join(d.page_content for d in unique_docs)
+    answer = _stream_answer(f"심층 분석 답변 요청:\n관련된 모든 정보:\n{final_context}\n\n최종 질문: {state['question']}")
     
     return {
         "strategy_used": "Complex (다단계 정밀 RAG)", 
-        "answer": res.content
+        "answer": answer
     }
 
 
@@ -182,8 +246,11 @@ def complex_strategy_node(state: AdaptiveRAGState) -> dict:
 # 🚦 5. 신호등(라우터) 및 전체 지도(Graph) 만들기
 # =============================================================================
 
-def route_complexity(state: AdaptiveRAGState) -> Literal["simple", "moderate", "complex"]:
+def route_complexity(state: AdaptiveRAGState) -> Literal["done", "simple", "moderate", "complex"]:
     """AI가 판단한 난이도 칸을 보고 어느 길로 갈지 안내합니다."""
+    # 분류 단계에서 이미 답변을 받았다면 바로 끝냅니다. (지름길)
+    if state.get("answer"):
+        return "done"
     return state["query_complexity"]
 
 def create_graph():
@@ -205,6 +272,7 @@ def create_graph():
         "classify",
         route_complexity, # 신호등 역할 함수
         {
+            "done": END,              # 분류와 동시에 답변 완료 (simple 지름길)
             "simple": "simple",
             "moderate": "moderate",
             "complex": "complex"
@@ -224,6 +292,17 @@ def create_graph():
 # ▶️ 6. 실제로 돌려보기 (실행 프로그램)
 # =============================================================================
 
+# 매번 새로 만들 필요 없는 빈 메모장 양식입니다.
+_INITIAL_STATE: AdaptiveRAGState = {
+    "question": "",
+    "query_complexity": "",
+    "strategy_used": "",
+    "documents": [],
+    "context": "",
+    "answer": ""
+}
+
+
 def run_adaptive_rag(query: str, app):
     """질문을 하면 AI가 난이도를 분석하고 그에 맞춰 답변해줍니다."""
     print(f"\n{'='*60}")
@@ -231,32 +310,45 @@ def run_adaptive_rag(query: str, app):
     print(f"{'='*60}")
     
     try:
-        # 가동 준비 및 초기 메모장 세팅
-        result = app.invoke({
-            "question": query,
-            "query_complexity": "",
-            "strategy_used": "",
-            "documents": [],
-            "context": "",
-            "answer": ""
-        })
+        # 가동 준비 및 초기 메모장 세팅 (빈 양식에 질문만 채워 넣습니다)
+        result = app.invoke({**_INITIAL_STATE, "question": query})
         
-        # 어떤 전략을 골랐는지와 최종 답변을 보여줍니다.
+        # 답변은 노드에서 실시간으로 출력되었으니, 어떤 전략을 골랐는지만 보여줍니다.
         print(f"\n📊 선택된 전략: {result['strategy_used']}")
-        print(f"\n🤖 AI의 답변:\n{result['answer']}")
         
     except Exception as e:
         log_llm_error(e)
         print(f"❌ 도중에 시스템 오류가 났습니다: {e}")
 
 
+def enable_input_history(history_file: Path = Path.home() / ".adaptive_rag_history"):
+    """방향키(↑/↓)로 이전 질문을 다시 불러올 수 있도록 입력 기록을 켭니다."""
+    try:
+        import readline  # Windows 기본 파이썬에는 없으므로 없으면 그냥 넘어갑니다.
+    except ImportError:
+        return
+    import atexit
+    
+    readline.set_history_length(1000)
+    try:
+        readline.read_history_file(history_file)
+    except OSError:
+        pass  # 첫 실행이라 기록 파일이 없는 경우
+    # 프로그램이 끝날 때 입력 기록을 파일로 저장합니다.
+    atexit.register(readline.write_history_file, history_file)
+
+
 if __name__ == "__main__":
     print("\n" + "🌟 상황 맞춤형 Adaptive RAG를 가동합니다! 🌟")
     print("질문의 난이도를 AI가 스스로 판단하여 가장 효율적으로 일합니다.")
     print("- 종료하려면 'q' 혹은 'exit'를 입력하세요.\n")
     
-    # 1. 뼈대가 되는 흐름도 기계를 완성합니다.
+    # 1. 뼈대가 되는 흐름도 기계를 완성하고, 질문 입력 기록을 켭니다.
     app = create_graph()
+    enable_input_history()
+    
+    # 지식 창고를 미리 열어 둡니다. (첫 질문이 데이터 적재를 기다리지 않도록)
+    get_adaptive_vs()
     
     # 2. 질문을 계속 받습니다.
     while True:
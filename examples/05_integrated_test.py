@@ -31,10 +31,16 @@
     python examples/05_integrated_test.py
 """
 
+import asyncio
+import atexit
+import re
+import operator
 import sys
 import os
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import TypedDict, List, Literal
+from typing import Annotated, TypedDict, List, Literal, Optional, Tuple, Union
 
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -44,17 +50,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # LangChain 구성 요소
-from langchain_openai import ChatOpenAI
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel, Field, field_validator
 
 # LangGraph 구성 요소
 from langgraph.graph import StateGraph, START, END
 
 # 프로젝트 유틸리티
-from utils.llm_factory import log_llm_error
-from utils.vector_store import VectorStoreManager
+from utils.llm_factory import aclose_async_http_client, get_llm, log_llm_error, warmup
+from utils.vector_store import VectorStoreManager, content_hash, dedupe_documents
 from utils.data_loader import get_rag_vector_store
 
 
@@ -86,62 +91,121 @@ class IntegratedRAGState(TypedDict):
     grade: str                       # 문서 관련성 평가 (relevant/irrelevant)
     loop_count: int                  # 쿼리 재작성 루프 카운터
     
-    # 디버깅용
-    steps_taken: List[str]           # 거쳐온 노드 기록
+    # 디버깅용 (operator.add 리듀서: 각 노드는 새로 거친 단계만 반환하면 뒤에 이어 붙여집니다)
+    steps_taken: Annotated[List[str], operator.add]  # 거쳐온 노드 기록
 
 
 # =============================================================================
 # 🗄️ 2. Vector Store 초기화 (공통 모듈 사용)
 # =============================================================================
 
+@lru_cache(maxsize=1)
 def get_vector_store() -> VectorStoreManager:
     """
     통합 RAG용 Vector Store 초기화
     
     모든 기능이 같은 collection을 공유하여 임베딩을 재사용합니다.
+    lru_cache로 한 번만 생성하여, 노드마다 폴더 해시 계산과 Chroma 초기화를 반복하지 않습니다.
     """
     return get_rag_vector_store(collection_name="rag_collection")
 
 
+# 모든 노드가 공유하는 LLM 인스턴스 (HTTP 커넥션 풀 재사용)
+# 모든 질문을 하나의 이벤트 루프(_EVENT_LOOP)에서 실행하므로 비동기 커넥션 풀도 공유합니다.
+_llm = get_llm(shared_async_client=True)
+
+
 # =============================================================================
 # 🧠 3. Adaptive RAG 노드: 질문 분류 (04a 기법)
 # =============================================================================
 
-def classify_query(state: IntegratedRAGState) -> dict:
+# LLM이 돌려준 난이도 문자열에서 세 단어 중 하나를 찾는 정규식 (모듈 로드 시 한 번만 컴파일)
+# 앞에 붙은 부정어("not complex", "isn't simple")도 함께 잡아서 부정된 단어는 건너뜁니다.
+_COMPLEXITY_RE = re.compile(r"(\bnot\s+|n't\s+)?\b(simple|moderate|complex)\b")
+
+
+def _parse_complexity(text) -> str:
     """
-    [Adaptive] 질문 난이도를 분류합니다.
+    난이도 문자열에서 부정되지 않은 첫 번째 난이도 단어를 돌려줍니다. (없으면 moderate)
     
-    - simple: 검색 없이 바로 답변 가능한 간단한 질문
-    - moderate: 일반적인 RAG 검색이 필요한 질문
-    - complex: 엔티티 추출 + 다단계 분석이 필요한 복잡한 질문
+    Example:
+        >>> _parse_complexity("not complex, this is simple")
+        'simple'
+        >>> _parse_complexity("Moderate.")
+        'moderate'
     """
-    print(f"\n🧐 [분류] 질문 난이도 분석 중...")
-    
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """질문을 분석하여 3가지 중 하나로 분류하세요. 단어 하나만 답하세요.
+    for match in _COMPLEXITY_RE.finditer(str(text).lower()):
+        if not match.group(1):
+            return match.group(2)
+    return "moderate"
+
+
+class QueryTriage(BaseModel):
+    """질문 분석 결과 (난이도 + 엔티티를 한 번의 LLM 호출로 받습니다)"""
+    complexity: Literal["simple", "moderate", "complex"] = Field(description="질문 난이도")
+    entities: List[str] = Field(default_factory=list, description="검색에 사용할 핵심 키워드(엔티티) 리스트")
+
+    @field_validator("complexity", mode="before")
+    @classmethod
+    def _normalize_complexity(cls, value):
+        # "Moderate", "complex." 등 표기가 조금 달라도 세 단어 중 하나로 맞추고, 없으면 moderate
+        return _parse_complexity(value)
+
+
+# 분류 + 엔티티 추출 체인 (모듈 로드 시 한 번만 조립)
+_CLASSIFY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """질문을 분석하여 난이도(complexity)와 핵심 키워드(entities)를 반환하세요.
+
+complexity 기준:
 1. "simple": 인사, 시간 묻기, 상식적인 질문
 2. "moderate": 한 번의 검색으로 답변 가능한 일반 질문  
-3. "complex": 여러 개념 비교, 심층 분석이 필요한 복잡한 질문"""),
-        ("human", "{question}"),
-    ])
+3. "complex": 여러 개념 비교, 심층 분석이 필요한 복잡한 질문
+
+entities: 검색에 사용할 핵심 키워드(엔티티) 리스트"""),
+    ("human", "{question}"),
+])
+_CLASSIFY_CHAIN = _CLASSIFY_PROMPT | _llm.with_structured_output(QueryTriage)
+
+
+@lru_cache(maxsize=1024)
+def _classify(question: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    질문 하나에 대한 (난이도, 엔티티) 분석 결과를 반환합니다.
     
-    response = (prompt | model).invoke({"question": state["question"]})
-    complexity = response.content.lower().strip()
+    같은 질문이 다시 들어오면 LLM을 호출하지 않고 캐시된 결과를 사용합니다.
+    (예외가 발생한 경우는 캐시되지 않습니다)
+    """
+    result = _CLASSIFY_CHAIN.invoke({"question": question})
+    return result.complexity, tuple(result.entities)
+
+
+async def classify_query(state: IntegratedRAGState) -> dict:
+    """
+    [Adaptive] 질문 난이도를 분류하고, 동시에 핵심 엔티티를 추출합니다.
+    
+    - simple: 검색 없이 바로 답변 가능한 간단한 질문
+    - moderate: 일반적인 RAG 검색이 필요한 질문
+    - complex: 엔티티 추출 + 다단계 분석이 필요한 복잡한 질문
+    
+    분류와 엔티티 추출을 한 번의 LLM 호출(구조화된 출력)로 처리하여
+    moderate 경로의 LLM 왕복 횟수를 절반으로 줄입니다.
+    """
+    print(f"\n🧐 [분석] 질문 난이도 분류 + 엔티티 추출 중...")
     
-    # 유효하지 않은 응답은 moderate로 기본 설정
-    if complexity not in ["simple", "moderate", "complex"]:
-        complexity = "moderate"
+    try:
+        # 캐시가 걸린 동기 함수이므로 별도 스레드에서 실행합니다.
+        complexity, entities = await asyncio.to_thread(_classify, state["question"])
+    except Exception as e:
+        print(f"   → 분석 결과 파싱 실패, 기본값 사용: {e}")
+        complexity, entities = "moderate", ()
     
     print(f"   → 판단 결과: '{complexity}' 수준")
+    entities = list(entities)
+    print(f"   → 추출된 엔티티: {entities}")
     
     return {
         "query_complexity": complexity,
+        "entities": entities,
         "steps_taken": ["classify"]
     }
 
@@ -150,24 +214,18 @@ def classify_query(state: IntegratedRAGState) -> dict:
 # ⚡ 4. Simple 전략: 직접 답변 (04a 기법)
 # =============================================================================
 
-def direct_answer(state: IntegratedRAGState) -> dict:
+async def direct_answer(state: IntegratedRAGState) -> dict:
     """
     [Simple] 검색 없이 LLM의 지식으로 직접 답변합니다.
     """
     print("⚡ [Simple] 검색 없이 바로 답변합니다.")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
-    response = model.invoke(state["question"])
+    response = await _llm.ainvoke(state["question"])
     
     return {
         "answer": response.content,
         "strategy_used": "Simple (직접 답변)",
-        "steps_taken": state["steps_taken"] + ["direct_answer"]
+        "steps_taken": ["direct_answer"]
     }
 
 
@@ -175,63 +233,42 @@ def direct_answer(state: IntegratedRAGState) -> dict:
 # 🏷️ 5. Entity RAG 노드들 (03 기법)
 # =============================================================================
 
-def extract_entities(state: IntegratedRAGState) -> dict:
-    """
-    [Entity RAG] LLM을 사용하여 질문에서 핵심 엔티티를 추출합니다.
-    """
-    print("🏷️ [Entity] 엔티티 추출 중...")
-    
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """질문에서 핵심 키워드(엔티티)를 추출하여 JSON 리스트로 반환하세요.
-예시: {{"entities": ["LangGraph", "RAG"]}}
-질문: {question}"""),
-    ])
-    
-    try:
-        chain = prompt | model | JsonOutputParser()
-        result = chain.invoke({"question": state["question"]})
-        entities = result.get("entities", [])
-        print(f"   → 추출된 엔티티: {entities}")
-        return {"entities": entities}
-    except Exception as e:
-        print(f"   → 추출 실패, 빈 리스트 반환: {e}")
-        return {"entities": []}
-
-
-def search_by_entity(state: IntegratedRAGState) -> dict:
+async def search_by_entity(state: IntegratedRAGState) -> dict:
     """
     [Entity RAG] 엔티티 기반 검색 (병렬 실행 1)
+    
+    엔티티별 검색을 각각 별도 스레드에서 동시에 실행합니다.
     """
     print("🔍 [Entity] 엔티티 기반 검색 수행...")
     
     vs = get_vector_store()
-    results = []
+    entities = state.get("entities", [])
+    
+    docs_lists = await asyncio.gather(
+        *(asyncio.to_thread(vs.search, entity, k=1) for entity in entities)
+    )
     
-    for entity in state.get("entities", []):
-        docs = vs.search(entity, k=1)
+    results = []
+    for entity, docs in zip(entities, docs_lists):
         results.extend(docs)
         print(f"   → '{entity}' 검색: {len(docs)}개 문서")
     
-    return {"entity_docs": results}
+    return {"entity_docs": results, "steps_taken": ["entity_search"]}
 
 
-def search_semantic(state: IntegratedRAGState) -> dict:
+async def search_semantic(state: IntegratedRAGState) -> dict:
     """
     [Entity RAG] 의미론적 검색 (병렬 실행 2)
+    
+    블로킹 검색을 별도 스레드에서 실행하여 엔티티 검색과 실제로 겹쳐 실행되게 합니다.
     """
     print("🔍 [Semantic] 의미론적 검색 수행...")
     
     vs = get_vector_store()
-    docs = vs.search(state["question"], k=2)
+    docs = await asyncio.to_thread(vs.search, state["question"], k=2)
     print(f"   → {len(docs)}개 문서 검색됨")
     
-    return {"semantic_docs": docs}
+    return {"semantic_docs": docs, "steps_taken": ["semantic_search"]}
 
 
 def merge_results(state: IntegratedRAGState) -> dict:
@@ -240,21 +277,15 @@ def merge_results(state: IntegratedRAGState) -> dict:
     """
     print("🔄 [Merge] 검색 결과 병합 중...")
     
-    seen = set()
-    merged = []
-    
+    # 전체 문자열 대신 내용 해시(16바이트)로 중복을 제거합니다.
     all_docs = state.get("entity_docs", []) + state.get("semantic_docs", [])
-    
-    for doc in all_docs:
-        if doc.page_content not in seen:
-            merged.append(doc)
-            seen.add(doc.page_content)
+    merged = dedupe_documents(all_docs)
     
     print(f"   → 총 {len(merged)}개 문서 병합됨")
     
     return {
         "documents": merged,
-        "steps_taken": state["steps_taken"] + ["entity_search", "semantic_search", "merge"]
+        "steps_taken": ["merge"]
     }
 
 
@@ -262,50 +293,185 @@ def merge_results(state: IntegratedRAGState) -> dict:
 # 📊 6. Advanced RAG 노드들 (04 기법)
 # =============================================================================
 
-def grade_documents(state: IntegratedRAGState) -> dict:
+# 문서 평가 방식: "llm"(기본값) 또는 "cross-encoder"(로컬 모델, 최초 실행 시 모델 다운로드)
+GRADER_MODE = os.getenv("DOCUMENT_GRADER", "llm").lower()
+# 한국어 문서를 평가해야 하므로 다국어 Cross-Encoder를 기본으로 사용합니다.
+CROSS_ENCODER_MODEL = os.getenv("CROSS_ENCODER_MODEL", "BAAI/bge-reranker-v2-m3")
+# 이 점수보다 높으면 관련 문서로 판단 (기본 모델은 0~1 사이 확률을 반환)
+# 로짓을 반환하는 모델(예: cross-encoder/ms-marco-MiniLM-L-6-v2)을 쓰면 0으로 설정하세요.
+CROSS_ENCODER_THRESHOLD = float(os.getenv("CROSS_ENCODER_THRESHOLD", "0.5"))
+
+# LLM 평가 시 동시에 보낼 최대 요청 수
+GRADE_MAX_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=1)
+def _get_cross_encoder():
     """
-    [Advanced] 검색된 문서의 관련성을 평가합니다 (Grading)
+    로컬 Cross-Encoder 모델을 한 번만 로드합니다.
+    
+    로드에 실패하면(패키지 없음, 모델 다운로드 불가 등) None을 반환하여
+    LLM 기반 평가로 자동 전환되도록 합니다.
     """
-    print("📊 [Grade] 문서 관련성 평가 중...")
+    try:
+        from sentence_transformers import CrossEncoder
+        print(f"   📥 Cross-Encoder 로드 중: {CROSS_ENCODER_MODEL}")
+        # 긴 문서는 모델이 토큰 단위로 잘라서 평가합니다. (글자 수로 자르면 한국어 문서가 지나치게 짧아짐)
+        return CrossEncoder(CROSS_ENCODER_MODEL, max_length=512)
+    except Exception as e:
+        print(f"   ⚠️ Cross-Encoder 로드 실패, LLM 평가로 대체합니다: {e}")
+        return None
+
+
+class Grade(BaseModel):
+    """문서 평가 결과"""
+    relevant: bool = Field(description="문서가 질문과 관련이 있으면 true")
+
+
+# 문서 평가 체인: 고정 지시문을 system 메시지로 분리하여 매 문서마다 같은 접두사가 재사용되도록 합니다.
+_GRADE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "문서가 질문과 관련이 있는지 판단하세요."),
+    ("human", "질문: {question}\n문서: {document}"),
+])
+_GRADE_CHAIN = _GRADE_PROMPT | _llm.with_structured_output(Grade)
+
+
+# 문서 평가 결과 캐시 (LRU): (질문 해시, 문서 해시) → 관련 여부
+# 긴 대화에서도 메모리가 계속 늘지 않도록 _classify 캐시와 같은 크기로 제한합니다.
+GRADE_CACHE_SIZE = 1024
+_GRADE_CACHE: "OrderedDict[Tuple[bytes, bytes], bool]" = OrderedDict()
+
+
+def _grade_cache_get(key: Tuple[bytes, bytes]) -> Optional[bool]:
+    """평가 결과 캐시에서 관련 여부를 꺼냅니다 (없으면 None)."""
+    verdict = _GRADE_CACHE.get(key)
+    if verdict is not None:
+        _GRADE_CACHE.move_to_end(key)
+    return verdict
+
+
+def _grade_cache_put(key: Tuple[bytes, bytes], verdict: bool) -> None:
+    """평가 결과를 저장하고, 용량을 넘으면 가장 오래 사용하지 않은 항목을 버립니다."""
+    _GRADE_CACHE[key] = verdict
+    _GRADE_CACHE.move_to_end(key)
+    if len(_GRADE_CACHE) > GRADE_CACHE_SIZE:
+        _GRADE_CACHE.popitem(last=False)
+
+
+async def _agrade_with_llm(question: str, documents: List[Document]) -> bool:
+    """
+    LLM에게 문서별로 관련 여부(relevant)를 물어 관련 문서가 하나라도 있는지 판단합니다.
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
+    이미 평가한 (질문, 문서) 쌍은 캐시에서 꺼내 쓰고, 나머지는 동시에 평가합니다
+    (동시 요청 수는 GRADE_MAX_CONCURRENCY로 제한). 관련 문서가 하나라도 나오면
+    그 즉시 남은 평가 요청을 취소하고 결과를 반환합니다.
+    """
+    question_key = content_hash(question)
+    keys = [(question_key, content_hash(doc.page_content)) for doc in documents]
     
-    prompt = ChatPromptTemplate.from_template(
-        """문서가 질문과 관련이 있으면 'yes', 없으면 'no'라고만 하세요.
-질문: {question}
-문서: {document}"""
-    )
+    # 1) 캐시에 이미 있는 결과부터 확인 (관련 문서가 있으면 LLM 호출 없이 종료)
+    pending = []
+    for i, key in enumerate(keys):
+        verdict = _grade_cache_get(key)
+        if verdict is None:
+            pending.append(i)
+        elif verdict:
+            print(f"   → 문서 {i+1}: 관련 있음 ✓ (캐시)")
+            return True
+        else:
+            print(f"   → 문서 {i+1}: 관련 없음 ✗ (캐시)")
     
-    chain = prompt | model
+    # 2) 나머지 문서를 동시에 평가하고, 먼저 끝난 순서대로 결과를 확인합니다.
+    semaphore = asyncio.Semaphore(GRADE_MAX_CONCURRENCY)
     
-    is_relevant = False
-    for i, doc in enumerate(state.get("documents", [])):
-        res = chain.invoke({
-            "question": state["question"],
-            "document": doc.page_content
-        })
-        
-        if "yes" in res.content.lower():
-            print(f"   → 문서 {i+1}: 관련 있음 ✓")
-            is_relevant = True
-            break
-        else:
+    async def grade_one(i: int) -> Tuple[int, bool]:
+        try:
+            async with semaphore:
+                res = await _GRADE_CHAIN.ainvoke(
+                    {"question": question, "document": documents[i].page_content}
+                )
+            # 구조화 출력이 None을 돌려주는 경우도 읽지 못한 결과로 처리합니다.
+            relevant = bool(res.relevant)
+        except Exception as e:
+            # 로컬 LLM이 양식에 맞지 않는 답을 주면 전체 실행을 멈추지 않고 이 문서만 '관련 없음'으로 처리
+            # (다음 질문에서 다시 평가할 수 있도록 캐시에는 저장하지 않음)
+            print(f"   → 문서 {i+1}: 평가 결과를 읽지 못함 ({type(e).__name__})")
+            return i, False
+        _grade_cache_put(keys[i], relevant)
+        return i, relevant
+    
+    tasks = [asyncio.create_task(grade_one(i)) for i in pending]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            i, relevant = await next_done
+            if relevant:
+                print(f"   → 문서 {i+1}: 관련 있음 ✓ (나머지 평가 생략)")
+                return True
             print(f"   → 문서 {i+1}: 관련 없음 ✗")
+    finally:
+        # 조기 종료했거나 오류가 난 경우 아직 진행 중인 요청을 취소하고,
+        # 취소가 끝날 때까지 기다려 연결과 태스크가 정리되도록 합니다.
+        pending_tasks = [task for task in tasks if not task.done()]
+        for task in pending_tasks:
+            task.cancel()
+        await asyncio.gather(*pending_tasks, return_exceptions=True)
+    
+    return False
+
+
+async def grade_documents(state: IntegratedRAGState) -> dict:
+    """
+    [Advanced] 검색된 문서의 관련성을 평가합니다 (Grading)
+    
+    기본적으로 LLM에게 문서별 관련 여부를 묻습니다. DOCUMENT_GRADER=cross-encoder이면
+    로컬 Cross-Encoder로 (질문, 문서) 쌍을 한 번에 점수화하고, 점수가
+    CROSS_ENCODER_THRESHOLD보다 큰 문서만 남깁니다. (로드 실패 시 LLM 평가로 대체)
+    """
+    print("📊 [Grade] 문서 관련성 평가 중...")
+    
+    documents = state.get("documents", [])
+    if not documents:
+        # 평가할 문서가 없으면 모델을 부르지 않고 바로 '관련 없음' 처리
+        print("   📋 검색된 문서 없음 → 평가 생략")
+        return {
+            "grade": "irrelevant",
+            "steps_taken": ["grade_documents"]
+        }
+    
+    reranker = _get_cross_encoder() if GRADER_MODE == "cross-encoder" else None
+    update = {}
+    
+    if reranker is not None:
+        # 모든 (질문, 문서) 쌍을 한 번의 배치 추론으로 점수화 (CPU 작업은 별도 스레드에서)
+        scores = await asyncio.to_thread(
+            reranker.predict,
+            [(state["question"], doc.page_content) for doc in documents],
+        )
+        relevant_docs = []
+        for i, (doc, score) in enumerate(zip(documents, scores)):
+            if score > CROSS_ENCODER_THRESHOLD:
+                print(f"   → 문서 {i+1}: 관련 있음 ✓ (점수: {score:.2f})")
+                relevant_docs.append(doc)
+            else:
+                print(f"   → 문서 {i+1}: 관련 없음 ✗ (점수: {score:.2f})")
+        
+        is_relevant = bool(relevant_docs)
+        if is_relevant:
+            update["documents"] = relevant_docs
+    else:
+        is_relevant = await _agrade_with_llm(state["question"], documents)
     
     grade = "relevant" if is_relevant else "irrelevant"
     print(f"   📋 최종 평가: {grade}")
     
     return {
+        **update,
         "grade": grade,
-        "steps_taken": state["steps_taken"] + ["grade_documents"]
+        "steps_taken": ["grade_documents"]
     }
 
 
-def rewrite_query(state: IntegratedRAGState) -> dict:
+async def rewrite_query(state: IntegratedRAGState) -> dict:
     """
     [Advanced] 관련 문서가 없을 때 질문을 재작성합니다 (Fallback)
     """
@@ -313,14 +479,8 @@ def rewrite_query(state: IntegratedRAGState) -> dict:
     
     current_count = state.get("loop_count", 0)
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
     # LLM을 사용하여 더 나은 검색 쿼리 생성
-    response = model.invoke(
+    response = await _llm.ainvoke(
         f"다음 질문을 검색에 더 적합하게 다시 작성해주세요. 질문만 출력하세요.\n원본: {state['question']}"
     )
     new_query = response.content.strip()
@@ -332,18 +492,18 @@ def rewrite_query(state: IntegratedRAGState) -> dict:
     return {
         "question": new_query,
         "loop_count": current_count + 1,
-        "steps_taken": state["steps_taken"] + ["rewrite_query"]
+        "steps_taken": ["rewrite_query"]
     }
 
 
-def retrieve_for_rewrite(state: IntegratedRAGState) -> dict:
+async def retrieve_for_rewrite(state: IntegratedRAGState) -> dict:
     """
     [Advanced] 재작성된 질문으로 다시 검색합니다
     """
     print(f"🔍 [Retrieve] 재검색 수행: {state['question']}")
     
     vs = get_vector_store()
-    docs = vs.search(state["question"], k=3)
+    docs = await asyncio.to_thread(vs.search, state["question"], k=3)
     
     print(f"   → {len(docs)}개 문서 검색됨")
     
@@ -354,7 +514,15 @@ def retrieve_for_rewrite(state: IntegratedRAGState) -> dict:
 # 📝 7. 답변 생성 노드
 # =============================================================================
 
-def generate_answer(state: IntegratedRAGState) -> dict:
+# 답변 생성 프롬프트 (고정 system 접두사 + 가변 human 메시지)
+_GENERATE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "참고 문서를 바탕으로 사용자의 질문에 정확하게 답변하세요."),
+    ("human", "참고 문서:\n{context}\n\n질문: {question}\n\n답변:"),
+])
+_GENERATE_CHAIN = _GENERATE_PROMPT | _llm
+
+
+async def generate_answer(state: IntegratedRAGState) -> dict:
     """
     검색된 문서를 기반으로 최종 답변을 생성합니다.
     """
@@ -362,39 +530,31 @@ def generate_answer(state: IntegratedRAGState) -> dict:
     
     context = "\n".join(d.page_content for d in state.get("documents", []))
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
-    response = model.invoke(f"참고 문서:\n{context}\n\n질문: {state['question']}\n\n답변:")
+    # 고정 지시문(system)을 앞에, 매번 바뀌는 문서/질문(human)을 뒤에 두어 prefix 캐시 적중률을 높입니다.
+    response = await _GENERATE_CHAIN.ainvoke({
+        "context": context,
+        "question": state["question"]
+    })
     
     return {
         "answer": response.content,
         "strategy_used": "Advanced RAG (Entity + Grading)",
-        "steps_taken": state["steps_taken"] + ["generate"]
+        "steps_taken": ["generate"]
     }
 
 
-def generate_fallback_answer(state: IntegratedRAGState) -> dict:
+async def generate_fallback_answer(state: IntegratedRAGState) -> dict:
     """
     관련 문서를 찾지 못했을 때 LLM 지식으로 답변합니다.
     """
     print("📝 [Fallback] 관련 문서 없음, 일반 지식으로 답변...")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
-    response = model.invoke(state["question"])
+    response = await _llm.ainvoke(state["question"])
     
     return {
         "answer": response.content,
         "strategy_used": "Fallback (일반 LLM)",
-        "steps_taken": state["steps_taken"] + ["fallback_generate"]
+        "steps_taken": ["fallback_generate"]
     }
 
 
@@ -402,44 +562,38 @@ def generate_fallback_answer(state: IntegratedRAGState) -> dict:
 # 🔬 8. Complex 전략: 다단계 분석 (04a 기법)
 # =============================================================================
 
-def complex_multi_step_rag(state: IntegratedRAGState) -> dict:
+async def complex_multi_step_rag(state: IntegratedRAGState) -> dict:
     """
     [Complex] 질문을 분해하여 다단계로 분석합니다.
+    
+    LLM 호출은 ainvoke로, 블로킹 벡터 검색은 별도 스레드에서 실행하여
+    이벤트 루프를 막지 않습니다.
     """
     print("🔬 [Complex] 다단계 정밀 분석 수행...")
     
-    model = ChatOpenAI(
-        base_url=os.getenv("OPENAI_API_BASE"),
-        api_key=os.getenv("OPENAI_API_KEY"),
-        model=os.getenv("OPENAI_MODEL")
-    )
-    
     # 1. 질문 분해
-    decompose_res = model.invoke(
+    decompose_res = await _llm.ainvoke(
         f"이 질문을 해결하기 위해 먼저 알아야 할 세부 질문 2개를 작성하세요. 한 줄씩 쓰세요.\n질문: {state['question']}"
     )
     sub_queries = [q.strip() for q in decompose_res.content.split("\n") if q.strip()][:2]
     print(f"   → 세부 질문: {sub_queries}")
     
-    # 2. 각 세부 질문 + 원본 질문으로 검색
+    # 2. 각 세부 질문 + 원본 질문을 한 번의 배치 검색으로 처리
     vs = get_vector_store()
-    all_context = []
+    results = await asyncio.to_thread(vs.search_batch, sub_queries + [state["question"]], 2)
     
-    for sq in sub_queries + [state["question"]]:
-        docs = vs.search(sq, k=2)
-        all_context.extend([d.page_content for d in docs])
+    # 3. 내용 해시 기준 중복 제거 (검색 순서 유지) 및 심층 답변 생성
+    unique_docs = dedupe_documents([d for group in results for d in group])
+    final_context = "\n".join(d.page_content for d in unique_docs)
     
-    # 3. 중복 제거 및 심층 답변 생성
-    final_context = "\n".join(list(set(all_context)))
-    
-    response = model.invoke(
+    response = await _llm.ainvoke(
         f"다음 정보를 바탕으로 심층 분석 답변을 작성하세요.\n\n참고 정보:\n{final_context}\n\n질문: {state['question']}"
     )
     
     return {
         "answer": response.content,
         "strategy_used": "Complex (다단계 정밀 RAG)",
-        "steps_taken": state["steps_taken"] + ["complex_multi_step"]
+        "steps_taken": ["complex_multi_step"]
     }
 
 
@@ -447,17 +601,29 @@ def complex_multi_step_rag(state: IntegratedRAGState) -> dict:
 # 🚦 9. 조건부 라우팅 함수들
 # =============================================================================
 
-def route_by_complexity(state: IntegratedRAGState) -> Literal["simple", "moderate", "complex"]:
+def route_by_complexity(state: IntegratedRAGState) -> Union[str, List[str]]:
     """
     분류된 난이도에 따라 경로를 결정합니다.
+    
+    moderate는 엔티티 검색과 의미론적 검색으로 동시에 분기(Fan-out)합니다.
     """
-    return state["query_complexity"]
+    complexity = state["query_complexity"]
+    if complexity == "simple":
+        return "direct_answer"
+    if complexity == "complex":
+        return "complex_rag"
+    return ["entity_search", "semantic_search"]
 
 
 def check_grade_and_loop(state: IntegratedRAGState) -> Literal["generate", "rewrite", "fallback"]:
     """
     문서 평가 결과와 루프 횟수에 따라 다음 단계를 결정합니다.
     """
+    # 검색 결과가 아예 없으면 재작성 루프를 돌지 않고 바로 fallback
+    if not state.get("documents"):
+        print("   ⚠️ 검색된 문서 없음 → fallback")
+        return "fallback"
+    
     # 최대 재시도 횟수 초과 시 fallback
     if state.get("loop_count", 0) > 1:
         print("   ⚠️ 최대 재시도 횟수 초과 → fallback")
@@ -485,14 +651,13 @@ def create_graph():
     # 노드 등록
     # -------------------------------------------------------------------------
     
-    # Adaptive 분류
+    # Adaptive 분류 (+ 엔티티 추출)
     builder.add_node("classify", classify_query)
     
     # Simple 전략
     builder.add_node("direct_answer", direct_answer)
     
     # Moderate 전략 (Entity RAG)
-    builder.add_node("extract_entities", extract_entities)
     builder.add_node("entity_search", search_by_entity)
     builder.add_node("semantic_search", search_semantic)
     builder.add_node("merge", merge_results)
@@ -514,15 +679,11 @@ def create_graph():
     # 시작 → 분류
     builder.add_edge(START, "classify")
     
-    # 난이도별 분기
+    # 난이도별 분기 (moderate는 두 검색 노드로 Fan-out)
     builder.add_conditional_edges(
         "classify",
         route_by_complexity,
-        {
-            "simple": "direct_answer",
-            "moderate": "extract_entities",
-            "complex": "complex_rag"
-        }
+        ["direct_answer", "entity_search", "semantic_search", "complex_rag"]
     )
     
     # Simple 종료
@@ -532,8 +693,6 @@ def create_graph():
     builder.add_edge("complex_rag", END)
     
     # Moderate: Entity RAG 병렬 검색
-    builder.add_edge("extract_entities", "entity_search")
-    builder.add_edge("extract_entities", "semantic_search")
     builder.add_edge("entity_search", "merge")
     builder.add_edge("semantic_search", "merge")
     
@@ -565,6 +724,41 @@ def create_graph():
 # ▶️ 11. 실행 함수 및 CLI
 # =============================================================================
 
+# 초기 상태 템플릿 (질문만 바꿔 끼워 사용합니다. 노드는 새 리스트를 반환하므로 공유해도 안전합니다)
+_INITIAL_STATE: IntegratedRAGState = {
+    "question": "",
+    "query_complexity": "",
+    "strategy_used": "",
+    "entities": [],
+    "entity_docs": [],
+    "semantic_docs": [],
+    "documents": [],
+    "grade": "",
+    "loop_count": 0,
+    "answer": "",
+    "steps_taken": []
+}
+
+
+# 질문마다 asyncio.run()으로 새 이벤트 루프를 만들면, 이전 루프에 묶인 LLM의
+# 비동기 커넥션 풀을 재사용할 수 없으므로 하나의 루프를 계속 사용합니다.
+_EVENT_LOOP = asyncio.new_event_loop()
+
+
+def _close_event_loop():
+    """프로그램 종료 시 공유 비동기 커넥션 풀을 닫고 이벤트 루프를 정리합니다."""
+    if _EVENT_LOOP.is_closed():
+        return
+    try:
+        _EVENT_LOOP.run_until_complete(aclose_async_http_client())
+        _EVENT_LOOP.run_until_complete(_EVENT_LOOP.shutdown_asyncgens())
+    finally:
+        _EVENT_LOOP.close()
+
+
+atexit.register(_close_event_loop)
+
+
 def run_integrated_rag(question: str, app):
     """
     통합 RAG 파이프라인을 실행합니다.
@@ -574,19 +768,10 @@ def run_integrated_rag(question: str, app):
     print("="*60)
     
     try:
-        result = app.invoke({
-            "question": question,
-            "query_complexity": "",
-            "strategy_used": "",
-            "entities": [],
-            "entity_docs": [],
-            "semantic_docs": [],
-            "documents": [],
-            "grade": "",
-            "loop_count": 0,
-            "answer": "",
-            "steps_taken": []
-        })
+        # 모든 I/O 노드가 비동기이므로 ainvoke로 실행합니다. (병렬 분기가 실제로 동시에 실행됨)
+        result = _EVENT_LOOP.run_until_complete(
+            app.ainvoke({**_INITIAL_STATE, "question": question})
+        )
         
         print(f"\n📊 사용된 전략: {result.get('strategy_used', 'Unknown')}")
         print(f"💡 실행 경로: {' → '.join(result.get('steps_taken', []))}")
@@ -608,6 +793,12 @@ if __name__ == "__main__":
     # 그래프 생성
     app = create_graph()
     
+    # LLM/임베딩 워밍업을 백그라운드로 먼저 시작해 아래 Vector Store 준비와 겹치게 합니다.
+    warmup(background=True)
+    
+    # Vector Store를 미리 준비 (필요 시 임베딩) - 첫 질문이 데이터 적재를 기다리지 않도록
+    get_vector_store()
+    
     while True:
         try:
             user_input = input("\n🙋 질문: ").strip()
@@ -1,29 +1,53 @@
 # -*- coding: utf-8 -*-
-import subprocess
+import io
+import os
+from datetime import datetime
 from fastmcp import FastMCP
 
 # MCP 서버 생성
 mcp = FastMCP("Directory Explorer")
 
+# 목록을 보여줄 드라이브 루트
+ROOT_PATH = "C:\\"
+
 @mcp.tool()
 def list_directory_c() -> str:
     """
     C: 드라이브의 디렉토리 및 파일 목록을 보여줍니다.
-    'dir c:\\' 명령어를 실행한 결과를 반환합니다.
+    'dir c:\\' 명령어와 같은 형식의 결과를 반환합니다.
     """
     try:
-        # 윈도우 dir 명령어 실행
-        # shell=True가 있어야 dir 같은 쉘 내부 명령어가 실행됨
-        result = subprocess.run(
-            ["cmd", "/c", "dir", "c:\\"], 
-            capture_output=True, 
-            text=True, 
-            encoding='cp949', # 한글 윈도우 기본 인코딩
-            check=True
-        )
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        return f"명령어 실행 중 오류 발생: {e}\n{e.stderr}"
+        # cmd.exe를 띄우는 대신 os.scandir로 직접 목록을 읽습니다.
+        # (DirEntry가 디렉토리 여부/stat 정보를 함께 가지고 있어 항목당 시스템 호출이 적음)
+        with os.scandir(ROOT_PATH) as it:
+            entries = sorted(it, key=lambda e: e.name.lower())
+
+        buf = io.StringIO()
+        buf.write(f" {ROOT_PATH} 디렉터리\n\n")
+        file_count, dir_count, total_size = 0, 0, 0
+
+        for entry in entries:
+            try:
+                stat = entry.stat()
+                is_dir = entry.is_dir()
+            except (PermissionError, FileNotFoundError):
+                # 접근이 제한된 시스템 폴더 등은 건너뜁니다.
+                continue
+
+            modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d  %H:%M")
+            if is_dir:
+                dir_count += 1
+                buf.write(f"{modified}    <DIR>          {entry.name}\n")
+            else:
+                file_count += 1
+                total_size += stat.st_size
+                buf.write(f"{modified}    {stat.st_size:>14,} {entry.name}\n")
+
+        buf.write(f"{file_count:>16}개 파일 {total_size:>20,} 바이트\n")
+        buf.write(f"{dir_count:>16}개 디렉터리\n")
+        return buf.getvalue()
+    except OSError as e:
+        return f"디렉토리 조회 중 오류 발생: {e}"
     except Exception as e:
         return f"예기치 않은 오류 발생: {e}"
 
@@ -2,11 +2,12 @@
 """Utils 패키지 초기화"""
 
 from utils.llm_factory import LLMFactory, get_llm, get_embeddings
-from utils.vector_store import VectorStoreManager
+from utils.vector_store import VectorStoreManager, dedupe_documents
 
 __all__ = [
     "LLMFactory",
     "get_llm",
     "get_embeddings",
     "VectorStoreManager",
+    "dedupe_documents",
 ]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+안전한 수식 계산 모듈
+
+Agent 예제의 calculate 도구에서 사용하는 수식 계산기입니다.
+파이썬 eval() 대신 AST(구문 트리)를 직접 해석하므로
+숫자와 산술 연산자 외의 코드는 실행되지 않습니다.
+
+주요 기능:
+    - 사칙연산, 거듭제곱, 나머지, 단항 부호 지원
+    - 수식별 파싱 결과 캐싱 (같은 수식은 다시 파싱하지 않음)
+
+사용 예시:
+    from utils.calculator import safe_eval
+
+    safe_eval("2 + 3 * 4")   # 14
+    safe_eval("(1 + 2) ** 3")  # 27
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from typing import Union
+
+Number = Union[int, float]
+
+# 허용하는 이항/단항 연산자 표 (AST 노드 타입 → 연산 함수)
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# 지나치게 큰 거듭제곱으로 CPU를 오래 점유하는 것을 막기 위한 지수 상한
+_MAX_EXPONENT = 1000
+
+# 정수 결과(중간값 포함)의 최대 비트 수 - 약 3000자리, 넘으면 계산하지 않고 거부
+_MAX_INT_BITS = 10_000
+
+
+def _check_int_size(value: Number) -> Number:
+    """정수 결과가 비트 상한을 넘으면 거부합니다. (큰 수가 다음 연산으로 넘어가지 않도록)"""
+    if isinstance(value, int) and value.bit_length() > _MAX_INT_BITS:
+        raise ValueError(f"계산 결과가 너무 큽니다 (최대 {_MAX_INT_BITS}비트)")
+    return value
+
+
+def _eval_node(node: ast.AST) -> Number:
+    """검증된 AST 노드를 재귀적으로 계산합니다."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return _check_int_size(node.value)
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        if isinstance(node.op, ast.Pow):
+            if abs(right) > _MAX_EXPONENT:
+                raise ValueError(f"지수가 너무 큽니다 (최대 {_MAX_EXPONENT})")
+            # 정수 거듭제곱은 결과 비트 수(밑의 비트 수 × 지수)를 계산 전에 확인
+            # (지수만 보면 ((9**999)**999)처럼 중첩된 거듭제곱을 막지 못함)
+            if isinstance(left, int) and isinstance(right, int) and left.bit_length() * right > _MAX_INT_BITS:
+                raise ValueError(f"계산 결과가 너무 큽니다 (최대 {_MAX_INT_BITS}비트)")
+        return _check_int_size(_BIN_OPS[type(node.op)](left, right))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _check_int_size(_UNARY_OPS[type(node.op)](_eval_node(node.operand)))
+
+    raise ValueError(f"지원하지 않는 수식 요소입니다: {type(node).__name__}")
+
+
+@lru_cache(maxsize=512)
+def _parse(expression: str) -> ast.Expression:
+    """수식을 AST로 파싱합니다 (수식 문자열별로 캐싱)."""
+    return ast.parse(expression.strip(), mode="eval")
+
+
+def safe_eval(expression: str) -> Number:
+    """
+    산술 수식을 안전하게 계산합니다.
+
+    Args:
+        expression: 계산할 수식 (예: "2 + 3 * 4", "100 / 5")
+
+    Returns:
+        Number: 계산 결과
+
+    Raises:
+        SyntaxError: 수식 문법이 잘못된 경우
+        ValueError: 숫자/산술 연산자 외의 요소가 포함된 경우
+        ZeroDivisionError: 0으로 나눈 경우
+
+    Example:
+        >>> safe_eval("2 + 3 * 4")
+        14
+    """
+    return _eval_node(_parse(expression).body)
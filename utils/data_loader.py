@@ -23,20 +23,22 @@ RAG 예제 파일들에서 공통으로 사용하는 데이터 로딩, 벡터화
 
 import os
 import json
+import mmap
+import struct
 import hashlib
 import logging
-from pathlib import Path
-from typing import List, Optional, Dict, Type
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Callable, Iterator, List, Optional, Dict, Tuple, Type
 
 from langchain_core.documents import Document
 from langchain_core.document_loaders.base import BaseLoader
 from langchain_community.document_loaders import (
-    DirectoryLoader,
     TextLoader,
     CSVLoader,
     PyPDFLoader,
     UnstructuredExcelLoader,
-    JSONLoader  # JSON 파일용 (일반 JSON 처리)
 )
 
 from utils.llm_factory import get_embeddings
@@ -45,6 +47,13 @@ from utils.vector_store import VectorStoreManager
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 파일 로딩을 동시에 실행할 최대 스레드 수 (모든 확장자가 함께 쓰는 상한, 디스크 과부하 방지)
+LOADER_MAX_WORKERS = int(os.getenv("RAG_LOADER_WORKERS", "4"))
+
+
+# pydantic v2는 model_construct, v1은 construct로 검증 없이 객체를 만듭니다.
+_construct_document = getattr(Document, "model_construct", None) or Document.construct
+
 
 # =============================================================================
 # 📄 커스텀 로더: JSONLineLoader (사용자 기존 코드 기반)
@@ -76,23 +85,43 @@ class JSONLineLoader(BaseLoader):
         """
         JSONL 파일을 로드하여 Document 리스트로 반환
         
+        파일을 메모리 맵(mmap)으로 열어 바이트 단위로 줄바꿈을 찾고,
+        내용이 있는 줄만 문자열로 디코딩합니다. (큰 파일에서 줄 단위 디코딩 비용 절감)
+        
         Returns:
             List[Document]: 각 줄을 Document로 변환한 리스트
         """
         docs = []  # 결과를 담을 리스트
+        append = docs.append
+        # 모든 줄의 출처가 같으므로 metadata는 한 번만 만들어 공유합니다.
+        # (청킹 시 text splitter가 문서마다 metadata를 복사하므로 공유해도 안전합니다)
+        metadata = {"source": self.file_path}
         
         try:
-            # 파일을 읽기 모드로 열기
-            with open(self.file_path, 'r', encoding=self.encoding) as f:
-                # 파일을 한 줄씩 순회
-                for line in f:
-                    # 빈 줄이 아닌 경우에만 처리
-                    if line.strip():
-                        # 줄 전체를 page_content로, 파일 경로를 metadata에 저장
-                        docs.append(Document(
-                            page_content=line,  # JSON 문자열 전체가 임베딩 대상
-                            metadata={"source": self.file_path}  # 출처 정보
-                        ))
+            # 파일을 바이너리 읽기 모드로 열기
+            with open(self.file_path, 'rb') as f:
+                # 빈 파일은 mmap으로 열 수 없으므로 바로 반환
+                if os.fstat(f.fileno()).st_size == 0:
+                    return docs
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start = 0
+                    size = len(mm)
+                    while start < size:
+                        # 다음 줄바꿈 위치 (없으면 파일 끝까지가 마지막 줄)
+                        end = mm.find(b"\n", start)
+                        end = size if end == -1 else end + 1
+                        raw = mm[start:end]
+                        start = end
+                        
+                        # 빈 줄이 아닌 경우에만 처리
+                        if raw.strip():
+                            # 줄 전체를 page_content로, 파일 경로를 metadata에 저장
+                            # 입력 형식이 정해져 있으므로 pydantic 검증 없이 바로 생성합니다.
+                            append(_construct_document(
+                                page_content=raw.decode(self.encoding),  # JSON 문자열 전체가 임베딩 대상
+                                metadata=metadata  # 출처 정보
+                            ))
         except Exception as e:
             # 오류 발생 시 로그 출력 (프로그램은 계속 진행)
             print(f"Error loading {self.file_path}: {e}")
@@ -104,47 +133,70 @@ class JSONLineLoader(BaseLoader):
 # 🔧 파일 변경 감지 유틸리티
 # =============================================================================
 
-def _get_folder_hash(folder_path: str, extensions: List[str]) -> str:
+def _iter_source_files(folder_path: str, extensions: List[str]) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    폴더를 한 번만 재귀 순회하며 지정된 확장자의 (확장자, 파일 항목) 쌍을 돌려줍니다.
+    
+    DirEntry는 순회 중에 얻은 파일 종류 정보를 캐시하고 있어
+    is_file()/stat() 호출 시 추가 시스템 호출이 거의 없습니다.
+    확장자는 소문자로 비교하므로 "REPORT.PDF"도 ".pdf"로 분류됩니다.
+    """
+    suffixes = frozenset(extensions)
+    pending = [folder_path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    # 확장자 목록을 돌지 않고 집합 조회 한 번으로 분류
+                    name = entry.name
+                    ext = name[name.rfind("."):].lower()
+                    if ext in suffixes and entry.is_file():
+                        yield ext, entry
+        except OSError:
+            # 접근할 수 없는 하위 폴더는 건너뜁니다.
+            continue
+
+
+# 파일 하나의 해시 입력 레코드: 경로 길이(uint32), 수정 시간 ns(uint64), 크기(uint64)
+_HASH_RECORD = struct.Struct("<IQQ")
+
+
+def _get_folder_hash(files_by_ext: Dict[str, List[os.DirEntry]]) -> str:
     """
     폴더 내 파일들의 해시값을 계산하여 변경 감지에 사용
     
-    파일 목록과 각 파일의 수정 시간을 조합하여 해시를 생성합니다.
+    파일 경로, 크기, 수정 시간(ns)을 조합하여 해시를 생성합니다.
     해시가 다르면 파일이 추가/수정/삭제된 것입니다.
+    (변경 감지용 키이므로 MD5 대신 빠른 blake2b를 사용하며, 파일당 stat은 한 번만 호출합니다)
     
     Args:
-        folder_path: 감시할 폴더 경로
-        extensions: 감시할 파일 확장자 목록
+        files_by_ext: 확장자별 파일 항목 (RAGDataLoader._scan_source_dir 결과)
     
     Returns:
         str: 폴더 상태를 나타내는 해시 문자열
     """
-    folder = Path(folder_path)
-    
-    # 폴더가 없으면 빈 해시 반환
-    if not folder.exists():
-        return "empty"
-    
-    # 파일 정보를 담을 리스트
+    # (경로, 수정 시간, 크기)를 수집하고 경로순으로 정렬하여 일관된 해시 생성
     file_info = []
-    
-    # 지정된 확장자의 파일들을 찾아서 정보 수집
-    for ext in extensions:
-        for file_path in folder.rglob(f"*{ext}"):
-            if file_path.is_file():
-                # 파일명과 수정 시간을 문자열로 저장
-                mtime = os.path.getmtime(file_path)
-                file_info.append(f"{file_path}:{mtime}")
-    
-    # 파일 정보를 정렬하여 일관된 해시 생성
+    for entries in files_by_ext.values():
+        for entry in entries:
+            stat = entry.stat()
+            file_info.append((entry.path, stat.st_mtime_ns, stat.st_size))
     file_info.sort()
     
     # 파일이 없으면 빈 해시 반환
     if not file_info:
         return "no_files"
     
-    # 문자열을 합쳐서 MD5 해시 생성
-    combined = "\n".join(file_info)
-    return hashlib.md5(combined.encode()).hexdigest()
+    # 문자열을 만들지 않고 (경로 길이, 수정 시간, 크기)를 바이너리로 묶어 바로 해시에 넣습니다.
+    digest = hashlib.blake2b(digest_size=16)
+    for path, mtime_ns, size in file_info:
+        path_bytes = path.encode()
+        digest.update(_HASH_RECORD.pack(len(path_bytes), mtime_ns, size))
+        digest.update(path_bytes)
+    return digest.hexdigest()
 
 
 def _get_hash_file_path(persist_directory: str) -> str:
@@ -152,21 +204,29 @@ def _get_hash_file_path(persist_directory: str) -> str:
     return os.path.join(persist_directory, ".folder_hash")
 
 
+@lru_cache(maxsize=64)
 def _read_saved_hash(persist_directory: str) -> Optional[str]:
-    """저장된 해시값 읽기"""
-    hash_file = _get_hash_file_path(persist_directory)
-    if os.path.exists(hash_file):
-        with open(hash_file, 'r') as f:
+    """
+    저장된 해시값 읽기
+    
+    해시 파일은 _save_hash로만 바뀌므로 디렉토리별로 한 번만 읽고 결과를 캐시합니다.
+    """
+    try:
+        with open(_get_hash_file_path(persist_directory), 'r') as f:
             return f.read().strip()
-    return None
+    except FileNotFoundError:
+        return None
 
 
 def _save_hash(persist_directory: str, hash_value: str):
-    """해시값 저장"""
+    """해시값 저장 (임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 파일이 깨지지 않음)"""
     hash_file = _get_hash_file_path(persist_directory)
     os.makedirs(persist_directory, exist_ok=True)
-    with open(hash_file, 'w') as f:
+    tmp_file = f"{hash_file}.tmp"
+    with open(tmp_file, 'w') as f:
         f.write(hash_value)
+    os.replace(tmp_file, hash_file)
+    _read_saved_hash.cache_clear()  # 저장된 해시가 바뀌었으므로 캐시 무효화
 
 
 # =============================================================================
@@ -191,21 +251,25 @@ class RAGDataLoader:
     """
     
     # 지원하는 파일 확장자와 로더 매핑
-    # DirectoryLoader에서 사용할 로더 클래스들
+    # 파일 하나당 로더 인스턴스를 하나씩 만들어 사용합니다.
     LOADER_MAP: Dict[str, Type[BaseLoader]] = {
         ".txt": TextLoader,           # 일반 텍스트 파일
         ".md": TextLoader,            # 마크다운 파일
         ".csv": CSVLoader,            # CSV 파일
         ".pdf": PyPDFLoader,          # PDF 문서
         ".xlsx": UnstructuredExcelLoader,  # Excel 파일
-        # JSON: JSONLoader 사용 (별도 처리)
+        # JSON: 표준 json 모듈로 파싱 (별도 처리)
         # JSONL: JSONLineLoader 사용 (별도 처리)
     }
     
+    # encoding 인자를 받는 로더들 (PDF/Excel 로더는 인코딩 인자가 없음)
+    ENCODING_LOADERS = (TextLoader, CSVLoader)
+    
     def __init__(
         self, 
         source_dir: str = "./rag",
-        encoding: str = "utf-8"
+        encoding: str = "utf-8",
+        max_workers: int = LOADER_MAX_WORKERS
     ):
         """
         RAGDataLoader 초기화
@@ -213,9 +277,12 @@ class RAGDataLoader:
         Args:
             source_dir: 데이터 소스 폴더 경로
             encoding: 파일 인코딩
+            max_workers: 파일 로딩을 동시에 실행할 최대 스레드 수 (모든 확장자 합계)
         """
         self.source_dir = source_dir  # 데이터를 읽어올 폴더
         self.encoding = encoding       # 파일 인코딩
+        self.max_workers = max(1, max_workers)  # 동시 로딩 스레드 수
+        self._scanned: Optional[Dict[str, List[os.DirEntry]]] = None  # 폴더 스캔 결과 캐시
         
         # 폴더가 없으면 생성
         if not os.path.exists(source_dir):
@@ -226,41 +293,34 @@ class RAGDataLoader:
         """
         소스 폴더의 모든 지원 파일을 로드
         
+        파일끼리는 서로 독립적이므로 모든 확장자의 파일을 스레드 풀 하나에 넣어 동시에 읽고,
+        디스크 읽기와 파싱(PDF, Excel 등)을 겹쳐 처리합니다. (동시 스레드 수는 max_workers 이하)
+        결과와 로그는 확장자 순서, 확장자 안에서는 파일 순서(경로순)대로 정리됩니다.
+        
         Returns:
             List[Document]: 로드된 모든 문서 리스트
         """
         print(f"\n📥 [데이터 로더] {self.source_dir} 폴더에서 파일 로딩 중...")
         
+        scanned = self._scan_source_dir()
         all_documents = []
         
-        # 각 확장자별로 파일 로드
-        for ext, loader_cls in self.LOADER_MAP.items():
-            try:
-                docs = self._load_by_extension(ext, loader_cls)
-                if docs:
-                    all_documents.extend(docs)
-                    print(f"   → {ext} 파일 {len(docs)}개 로드 완료")
-            except Exception as e:
-                # 특정 확장자 로드 실패해도 계속 진행
-                print(f"   ⚠️ {ext} 로더 경고: {str(e)[:50]}...")
-        
-        # JSON 파일 로드 (LangChain JSONLoader 사용)
-        try:
-            json_docs = self._load_json_files()
-            if json_docs:
-                all_documents.extend(json_docs)
-                print(f"   → .json 파일 {len(json_docs)}개 로드 완료")
-        except Exception as e:
-            print(f"   ⚠️ .json 로더 경고: {str(e)[:50]}...")
-        
-        # JSONL 파일 로드 (커스텀 JSONLineLoader 사용 - 한 줄씩 처리)
-        try:
-            jsonl_docs = self._load_jsonl_files()
-            if jsonl_docs:
-                all_documents.extend(jsonl_docs)
-                print(f"   → .jsonl 파일 {len(jsonl_docs)}개 로드 완료")
-        except Exception as e:
-            print(f"   ⚠️ .jsonl 로더 경고: {str(e)[:50]}...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # 확장자마다 파일별 작업을 같은 풀에 제출 (확장자별로 풀을 따로 만들지 않음)
+            futures = [
+                (ext, [pool.submit(load_one, entry.path) for entry in scanned.get(ext, [])])
+                for ext, load_one in self._file_loaders()
+            ]
+            
+            for ext, file_futures in futures:
+                try:
+                    docs = list(chain.from_iterable(f.result() for f in file_futures))
+                    if docs:
+                        all_documents.extend(docs)
+                        print(f"   → {ext} 파일 {len(docs)}개 로드 완료")
+                except Exception as e:
+                    # 특정 확장자 로드 실패해도 계속 진행
+                    print(f"   ⚠️ {ext} 로더 경고: {str(e)[:50]}...")
         
         if all_documents:
             print(f"✅ 총 {len(all_documents)}개의 문서가 로드되었습니다.")
@@ -269,6 +329,60 @@ class RAGDataLoader:
         
         return all_documents
     
+    def _scan_source_dir(self) -> Dict[str, List[os.DirEntry]]:
+        """
+        소스 폴더를 한 번만 순회하여 지원하는 파일들을 확장자별로 분류합니다.
+        
+        확장자마다 폴더 전체를 다시 탐색하지 않도록, 결과는 인스턴스에 캐시되어
+        변경 감지 해시 계산과 확장자별 로딩에서 함께 사용됩니다.
+        
+        Returns:
+            Dict[str, List[os.DirEntry]]: 확장자 → 파일 항목 리스트 (경로순 정렬)
+        """
+        if self._scanned is None:
+            files_by_ext: Dict[str, List[os.DirEntry]] = {
+                ext: [] for ext in self.get_supported_extensions()
+            }
+            for ext, entry in _iter_source_files(self.source_dir, list(files_by_ext)):
+                files_by_ext[ext].append(entry)
+            for entries in files_by_ext.values():
+                entries.sort(key=lambda e: e.path)
+            self._scanned = files_by_ext
+        return self._scanned
+    
+    def _file_loaders(self) -> List[Tuple[str, Callable[[str], List[Document]]]]:
+        """
+        (확장자, 파일 하나를 읽는 함수) 목록을 반환합니다.
+        
+        JSON은 표준 json 파싱, JSONL은 커스텀 JSONLineLoader(한 줄씩 처리) 사용
+        """
+        loaders = [
+            (ext, partial(self._load_one_file, loader_cls))
+            for ext, loader_cls in self.LOADER_MAP.items()
+        ]
+        loaders.append((".json", self._load_one_json))
+        loaders.append((".jsonl", self._load_one_jsonl))
+        return loaders
+    
+    def _load_files(
+        self,
+        entries: List[os.DirEntry],
+        load_one: Callable[[str], List[Document]]
+    ) -> List[Document]:
+        """
+        파일 목록을 파일별 로드 함수로 읽어 하나의 문서 리스트로 합칩니다.
+        
+        파일끼리는 서로 독립적이므로 파일이 여러 개면 스레드 풀에서 동시에 읽습니다.
+        결과는 파일 순서(경로순)대로 합쳐집니다.
+        """
+        paths = [entry.path for entry in entries]
+        if len(paths) <= 1:
+            results = [load_one(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+                results = list(pool.map(load_one, paths))
+        return list(chain.from_iterable(results))
+    
     def _load_by_extension(
         self, 
         extension: str, 
@@ -284,55 +398,67 @@ class RAGDataLoader:
         Returns:
             List[Document]: 해당 확장자 파일들의 문서 리스트
         """
-        # DirectoryLoader 사용
-        loader = DirectoryLoader(
-            path=self.source_dir,
-            glob=f"**/*{extension}",
-            loader_cls=loader_cls,
-            loader_kwargs={"encoding": self.encoding},
-            use_multithreading=False,  # Windows 안정성
-            silent_errors=True
+        return self._load_files(
+            self._scan_source_dir().get(extension, []),
+            partial(self._load_one_file, loader_cls),
         )
-        
-        return loader.load()
+    
+    def _load_one_file(self, loader_cls: Type[BaseLoader], file_path: str) -> List[Document]:
+        """LOADER_MAP의 로더로 파일 하나를 로드합니다 (실패 시 빈 리스트)."""
+        loader_kwargs = {"encoding": self.encoding} if loader_cls in self.ENCODING_LOADERS else {}
+        try:
+            return loader_cls(file_path, **loader_kwargs).load()
+        except Exception as e:
+            # 파일 하나가 실패해도 나머지는 계속 로드
+            logger.warning("%s 로드 실패: %s", file_path, e)
+            return []
     
     def _load_json_files(self) -> List[Document]:
         """
-        JSON 파일을 LangChain JSONLoader로 로드
+        JSON 파일을 로드
         
         일반 JSON 파일을 전체 구조로 파싱하여 Document로 변환합니다.
         
         Returns:
             List[Document]: 로드된 문서 리스트
         """
-        documents = []
-        source_path = Path(self.source_dir)
+        # .json 파일 (폴더 스캔 결과 사용)
+        return self._load_files(self._scan_source_dir().get(".json", []), self._load_one_json)
+    
+    def _load_one_json(self, file_path: str) -> List[Document]:
+        """JSON 파일 하나를 로드합니다 (파싱 오류 시 텍스트로 읽기)."""
+        try:
+            # 전체 JSON 구조를 텍스트로 변환 - 예전 JSONLoader(jq_schema=".", text_content=False)와
+            # 같은 page_content/metadata를 만들어 기존 벡터 저장소의 임베딩과 청크 ID가 바뀌지 않게 합니다.
+            # (스키마가 "전체 선택"뿐이므로 파일마다 jq 프로그램을 컴파일하지 않고 표준 json으로 처리)
+            with open(file_path, 'r', encoding="utf-8") as f:
+                data = json.loads(f.read())
+        except ValueError:
+            # JSON 파싱(또는 UTF-8 디코딩) 오류 시 원문 텍스트를 그대로 사용
+            try:
+                with open(file_path, 'r', encoding=self.encoding) as f:
+                    content = f.read()
+            except Exception as e:
+                print(f"   ⚠️ JSON 로드 실패 {file_path}: {e}")
+                return []
+            return [_construct_document(page_content=content, metadata={"source": file_path})]
+        except Exception as e:
+            print(f"   ⚠️ JSON 로드 실패 {file_path}: {e}")
+            return []
         
-        # .json 파일 찾기
-        for file_path in source_path.rglob("*.json"):
-            if file_path.is_file():
-                try:
-                    # JSONLoader: 전체 JSON 구조를 텍스트로 변환
-                    loader = JSONLoader(
-                        file_path=str(file_path),
-                        jq_schema=".",  # 전체 JSON 객체 선택
-                        text_content=False  # JSON을 문자열로 변환
-                    )
-                    docs = loader.load()
-                    documents.extend(docs)
-                except Exception as e:
-                    # jq 관련 오류 시 텍스트로 읽기 fallback
-                    try:
-                        with open(file_path, 'r', encoding=self.encoding) as f:
-                            content = f.read()
-                        documents.append(Document(
-                            page_content=content,
-                            metadata={"source": str(file_path)}
-                        ))
-                    except Exception as fallback_e:
-                        print(f"   ⚠️ JSON 로드 실패 {file_path}: {fallback_e}")
+        # JSONLoader._get_text와 같은 규칙: 문자열은 그대로, dict는 json.dumps(빈 dict는 ""),
+        # 그 밖의 값(list, 숫자 등)은 str(), null은 ""
+        if isinstance(data, str):
+            content = data
+        elif isinstance(data, dict):
+            content = json.dumps(data) if data else ""
+        else:
+            content = str(data) if data is not None else ""
         
-        return documents
+        return [_construct_document(
+            page_content=content,
+            metadata={"source": os.path.realpath(file_path), "seq_num": 1}
+        )]
     
     def _load_jsonl_files(self) -> List[Document]:
         """
@@ -343,20 +469,12 @@ class RAGDataLoader:
         Returns:
             List[Document]: 로드된 문서 리스트
         """
-        documents = []
-        source_path = Path(self.source_dir)
-        
-        # .jsonl 파일 찾기
-        for file_path in source_path.rglob("*.jsonl"):
-            if file_path.is_file():
-                loader = JSONLineLoader(
-                    file_path=str(file_path),
-                    encoding=self.encoding
-                )
-                docs = loader.load()
-                documents.extend(docs)
-        
-        return documents
+        # .jsonl 파일 (폴더 스캔 결과 사용)
+        return self._load_files(self._scan_source_dir().get(".jsonl", []), self._load_one_jsonl)
+    
+    def _load_one_jsonl(self, file_path: str) -> List[Document]:
+        """JSONL 파일 하나를 한 줄씩 별도 Document로 로드합니다."""
+        return JSONLineLoader(file_path=file_path, encoding=self.encoding).load()
     
     def get_supported_extensions(self) -> List[str]:
         """지원하는 파일 확장자 목록 반환"""
@@ -372,7 +490,9 @@ def get_rag_vector_store(
     source_dir: str = "./rag",
     persist_dir: str = "./vector_db",
     embedding_provider: Optional[str] = None,
-    force_reload: bool = False
+    force_reload: bool = False,
+    batch_size: int = 64,
+    concurrency: int = 4,
 ) -> VectorStoreManager:
     """
     RAG용 Vector Store를 초기화하고 데이터를 로드합니다.
@@ -386,6 +506,8 @@ def get_rag_vector_store(
         persist_dir: Vector Store 영속화 폴더 (기본값: ./vector_db)
         embedding_provider: 임베딩 provider ("openai" 또는 "ollama", None이면 환경변수 사용)
         force_reload: True면 파일 변경 여부와 관계없이 강제 재임베딩
+        batch_size: 임베딩 API 한 번에 보낼 청크 수 (기본값: 64)
+        concurrency: 동시에 요청할 배치 수 (기본값: 4)
     
     Returns:
         VectorStoreManager: 초기화된 Vector Store 매니저
@@ -407,13 +529,14 @@ def get_rag_vector_store(
     manager = VectorStoreManager(
         embeddings=embeddings,
         collection_name=collection_name,
-        persist_directory=collection_persist_dir
+        persist_directory=collection_persist_dir,
+        embedding_batch_size=batch_size,
     )
     
     # 파일 변경 감지를 위한 해시 계산
+    # (폴더는 한 번만 순회하고, 그 결과를 이후 데이터 로드에서도 재사용합니다)
     loader = RAGDataLoader(source_dir=source_dir)
-    extensions = loader.get_supported_extensions()
-    current_hash = _get_folder_hash(source_dir, extensions)
+    current_hash = _get_folder_hash(loader._scan_source_dir())
     saved_hash = _read_saved_hash(collection_persist_dir)
     
     # 재임베딩 필요 여부 판단
@@ -432,9 +555,15 @@ def get_rag_vector_store(
         documents = loader.load_all()
         
         if documents:
-            # Vector Store에 문서 추가 (자동으로 청킹 및 임베딩)
-            manager.add_documents(documents)
-            print(f"✅ {len(documents)}개의 문서가 Vector Store에 저장되었습니다.")
+            doc_count = len(documents)
+            # 청크로 먼저 분할한 뒤 원본 문서 리스트는 바로 해제합니다.
+            # (임베딩이 진행되는 동안 원본과 청크를 함께 메모리에 들고 있지 않도록)
+            chunks = manager.split_documents(documents)
+            del documents
+            
+            # Vector Store에 청크 추가 (임베딩, 배치 단위로 동시 요청)
+            manager.add_documents(chunks, split=False, concurrency=concurrency)
+            print(f"✅ {doc_count}개의 문서가 Vector Store에 저장되었습니다.")
         else:
             # 데이터가 없으면 기본 텍스트 추가
             print("   ⚠️ 로딩된 문서가 없습니다. 기본 테스트 데이터를 적재합니다.")
@@ -1,8 +1,11 @@
+import asyncio
+import io
 import os
 import sys
 from pathlib import Path
 import httpx
 import logging
+from typing import List
 
 # .env 파일에서 환경변수 로드
 from dotenv import load_dotenv
@@ -17,24 +20,12 @@ from langchain_openai import ChatOpenAI
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("diagnosis")
 
-def diagnose():
-    # 환경변수에서 설정 로드
-    api_key = os.getenv("OPENAI_API_KEY", "lm-studio")
-    base_url = os.getenv("OPENAI_API_BASE", "http://localhost:1234/v1")
-    model = os.getenv("OPENAI_MODEL", "local-model")
-    
-    print("\n" + "="*60)
-    print("🔍 LLM 연결 진단 스크립트")
-    print("="*60)
-    
-    print(f"📍 Target Base URL: {base_url}")
-    print(f"🔑 API Key: {api_key[:4]}***")
-    
-    # 1. 단순 HTTP 연결 (Models 엔드포인트)
-    print("\n[1] 기본 HTTP 연결 테스트 (/v1/models)")
+def _probe_models(out, api_key: str, base_url: str):
+    """[1] 단순 HTTP 연결 (Models 엔드포인트)"""
+    print("\n[1] 기본 HTTP 연결 테스트 (/v1/models)", file=out)
     try:
         models_url = f"{base_url.rstrip('/')}/models"
-        print(f"   URL: {models_url}")
+        print(f"   URL: {models_url}", file=out)
         
         # Curl과 유사한 헤더 설정
         headers = {
@@ -48,23 +39,25 @@ def diagnose():
         with httpx.Client(transport=transport, trust_env=False, verify=False) as client:
             response = client.get(models_url, headers=headers, timeout=10.0)
         
-        print(f"   상태 코드: {response.status_code}")
+        print(f"   상태 코드: {response.status_code}", file=out)
         if response.status_code == 200:
-            print("   ✅ 연결 성공!")
+            print("   ✅ 연결 성공!", file=out)
             try:
                 data = response.json()
-                print(f"   모델 목록: {[m['id'] for m in data.get('data', [])[:3]]} ...")
+                print(f"   모델 목록: {[m['id'] for m in data.get('data', [])[:3]]} ...", file=out)
             except:
-                print(f"   응답 본문: {response.text[:100]}...")
+                print(f"   응답 본문: {response.text[:100]}...", file=out)
         else:
-            print(f"   ❌ 연결 실패 (HTTP {response.status_code})")
-            print(f"   응답 본문: {response.text}")
+            print(f"   ❌ 연결 실패 (HTTP {response.status_code})", file=out)
+            print(f"   응답 본문: {response.text}", file=out)
             
     except Exception as e:
-        print(f"   ❌ 예외 발생: {e}")
+        print(f"   ❌ 예외 발생: {e}", file=out)
+
 
-    # 2. LangChain ChatOpenAI 테스트
-    print("\n[2] LangChain ChatOpenAI 테스트")
+def _probe_langchain(out, api_key: str, base_url: str, model: str):
+    """[2] LangChain ChatOpenAI 테스트"""
+    print("\n[2] LangChain ChatOpenAI 테스트", file=out)
     try:
         llm = ChatOpenAI(
             api_key=api_key,
@@ -74,39 +67,43 @@ def diagnose():
             max_retries=1, # 빠른 실패를 위해
         )
         
-        print(f"   LLM 생성: {llm}")
-        print("   메시지 전송 중...") 
+        print(f"   LLM 생성: {llm}", file=out)
+        print("   메시지 전송 중...", file=out) 
         
         # 클라이언트의 실제 Base URL 확인
         try:
             if hasattr(llm, "client") and hasattr(llm.client, "base_url"):
-                 print(f"   OpenAI Client Base URL: {llm.client.base_url}")
+                 print(f"   OpenAI Client Base URL: {llm.client.base_url}", file=out)
             elif hasattr(llm, "base_url"):
-                 print(f"   ChatOpenAI Base URL: {llm.base_url}")
+                 print(f"   ChatOpenAI Base URL: {llm.base_url}", file=out)
         except Exception as e:
-            print(f"   (Base URL 확인 불가: {e})")
+            print(f"   (Base URL 확인 불가: {e})", file=out)
         
         response = llm.invoke("Hello, simple test.")
-        print(f"   ✅ 응답 수신: {response.content}")
+        print(f"   ✅ 응답 수신: {response.content}", file=out)
         
     except Exception as e:
-        print(f"   ❌ LangChain 오류: {e}")
+        print(f"   ❌ LangChain 오류: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
 
-    # 3. Typo Check (Completitions)
-    print("\n[3] Typo URL Check (/chat/completitions)")
+
+def _probe_typo(out, api_key: str, base_url: str):
+    """[3] Typo Check (Completitions)"""
+    print("\n[3] Typo URL Check (/chat/completitions)", file=out)
     try:
         typo_url = f"{base_url.rstrip('/')}/chat/completitions"
-        print(f"   Testing Typo URL: {typo_url}")
+        print(f"   Testing Typo URL: {typo_url}", file=out)
         response = httpx.post(typo_url, headers={"Authorization": f"Bearer {api_key}"}, timeout=2.0)
-        print(f"   상태 코드: {response.status_code}")
+        print(f"   상태 코드: {response.status_code}", file=out)
         if response.status_code != 404:
-             print("   ⚠️ WARNING: 서버가 오타난 URL(/chat/completitions)에 응답했습니다!")
+             print("   ⚠️ WARNING: 서버가 오타난 URL(/chat/completitions)에 응답했습니다!", file=out)
     except Exception as e:
-        print(f"   (오타 URL 연결 실패 - 정상: {e})")
+        print(f"   (오타 URL 연결 실패 - 정상: {e})", file=out)
+
 
-    # 4. LangChain Streaming 테스트
+def _probe_stream(api_key: str, base_url: str, model: str):
+    """[4] LangChain Streaming 테스트 (글자가 나오는 모습을 직접 봐야 하므로 화면에 바로 출력)"""
     print("\n[4] LangChain 스트리밍 테스트")
     try:
         llm = ChatOpenAI(
@@ -131,5 +128,43 @@ def diagnose():
     except Exception as e:
         print(f"\n   ❌ 스트리밍 오류: {e}")
 
+
+async def _run_probes(api_key: str, base_url: str, model: str) -> List[str]:
+    """
+    서로 독립적인 [1]~[3] 진단을 동시에 실행하고, 각 진단의 출력을 순서대로 돌려줍니다.
+    
+    각 진단은 자기 전용 버퍼(StringIO)에 출력하므로 결과가 섞이지 않습니다.
+    """
+    buffers = [io.StringIO() for _ in range(3)]
+    await asyncio.gather(
+        asyncio.to_thread(_probe_models, buffers[0], api_key, base_url),
+        asyncio.to_thread(_probe_langchain, buffers[1], api_key, base_url, model),
+        asyncio.to_thread(_probe_typo, buffers[2], api_key, base_url),
+        return_exceptions=True,
+    )
+    return [buf.getvalue() for buf in buffers]
+
+
+def diagnose():
+    # 환경변수에서 설정 로드
+    api_key = os.getenv("OPENAI_API_KEY", "lm-studio")
+    base_url = os.getenv("OPENAI_API_BASE", "http://localhost:1234/v1")
+    model = os.getenv("OPENAI_MODEL", "local-model")
+    
+    print("\n" + "="*60)
+    print("🔍 LLM 연결 진단 스크립트")
+    print("="*60)
+    
+    print(f"📍 Target Base URL: {base_url}")
+    print(f"🔑 API Key: {api_key[:4]}***")
+    
+    # 1~3. 연결/호출/오타 URL 진단은 동시에 실행하고 결과는 번호 순서대로 출력
+    print("\n⏳ [1]~[3] 진단을 동시에 실행 중...")
+    for report in asyncio.run(_run_probes(api_key, base_url, model)):
+        print(report, end="")
+
+    # 4. 스트리밍은 실시간 출력을 확인해야 하므로 마지막에 따로 실행
+    _probe_stream(api_key, base_url, model)
+
 if __name__ == "__main__":
     diagnose()
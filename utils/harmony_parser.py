@@ -8,14 +8,27 @@ vLLM 서버와의 통신 시 메시지 호환성을 보장합니다.
 
 import json
 import logging
-import uuid
-from typing import List, Any, Optional, Union
+import re
+import secrets
+from functools import lru_cache
+from typing import List, Any, Callable, FrozenSet, Optional, Tuple, Union
 
 from langchain_core.messages import AIMessage, ToolMessage, HumanMessage, SystemMessage, BaseMessage
 from langchain_core.tools import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# orjson이 설치되어 있으면 더 빠른 C 구현으로 JSON을 파싱합니다. (없으면 표준 json 사용)
+# orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스라 예외 처리는 동일합니다.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# JSON 객체 형태 응답 판별용 (앞쪽 공백 뒤에 { 로 시작)
+# 도구 인자는 항상 JSON 객체이므로 [ 로 시작하는 배열은 파싱하지 않습니다.
+_JSON_START = re.compile(r"\s*\{")
+
 
 def parse_harmony_tool_call(
     response: AIMessage,
@@ -27,15 +40,20 @@ def parse_harmony_tool_call(
     if response.tool_calls:
         return response
     
+    # 매칭할 도구가 없으면 파싱할 필요가 없습니다.
+    if not available_tools:
+        return response
+    
     if not response.content or not isinstance(response.content, str):
         return response
     
-    content = response.content.strip()
-    if not (content.startswith('{') or content.startswith('[')):
+    # 앞쪽 공백만 건너뛰고 첫 글자가 { 인지 확인 (일반 텍스트 답변은 문자열 복사 없이 바로 반환)
+    if not _JSON_START.match(response.content):
         return response
     
     try:
-        parsed = json.loads(content)
+        # JSON 파서는 앞뒤 공백을 허용하므로 strip() 없이 그대로 파싱합니다.
+        parsed = _json_loads(response.content)
     except json.JSONDecodeError:
         return response
     
@@ -45,7 +63,7 @@ def parse_harmony_tool_call(
     
     tool_name, tool_args = matched_tool
     tool_call = {
-        "id": f"call_{uuid.uuid4().hex[:8]}",
+        "id": f"call_{secrets.token_hex(4)}",
         "name": tool_name,
         "args": tool_args
     }
@@ -62,48 +80,100 @@ def parse_harmony_tool_call(
     )
 
 
+def _clean_ai(msg: AIMessage) -> BaseMessage:
+    # 1. tool_calls가 포함된 Assistant 메시지 처리
+    if not msg.tool_calls:
+        return msg
+    # content가 비어있으면 서버가 400 에러를 낼 수 있음
+    content = msg.content if msg.content else "Calling tool..."
+    return AIMessage(content=content)
+
+
+def _clean_tool(msg: ToolMessage) -> BaseMessage:
+    # 2. Tool 역할의 메시지 처리 (vLLM이 싫어함)
+    # User 역할로 위장하여 전송하고 content가 문자열인지 확인
+    content = str(msg.content) if msg.content else "No result."
+    return HumanMessage(content=f"Observation: {content}")
+
+
+def _is_plain(msg: BaseMessage) -> bool:
+    """이미 문자열 content만 가진 메시지인지 확인 (새로 만들 필요가 없음)"""
+    return isinstance(msg.content, str) and not msg.additional_kwargs and not msg.name
+
+
+def _clean_human(msg: HumanMessage) -> BaseMessage:
+    if _is_plain(msg):
+        return msg
+    return HumanMessage(content=str(msg.content))
+
+
+def _clean_system(msg: SystemMessage) -> BaseMessage:
+    if _is_plain(msg):
+        return msg
+    return SystemMessage(content=str(msg.content))
+
+
+# 메시지 타입별 정제 함수 (위에서부터 먼저 일치하는 타입 사용)
+_CLEANERS = (
+    (AIMessage, _clean_ai),
+    (ToolMessage, _clean_tool),
+    (HumanMessage, _clean_human),
+    (SystemMessage, _clean_system),
+)
+
+
+@lru_cache(maxsize=None)
+def _cleaner_for(msg_type: type) -> Optional[Callable[[BaseMessage], BaseMessage]]:
+    """메시지 클래스별 정제 함수를 한 번만 찾아 캐시합니다. (AIMessageChunk 등 하위 클래스 포함)"""
+    for base, cleaner in _CLEANERS:
+        if issubclass(msg_type, base):
+            return cleaner
+    return None
+
+
 def clean_history_for_harmony(messages: List[BaseMessage]) -> List[BaseMessage]:
     """
     vLLM 서버(GPT-OSS)가 거부감을 느끼지 않도록 대화 기록을 엄격하게 정제합니다.
     """
-    cleaned = []
-    for msg in messages:
-        # 1. tool_calls가 포함된 Assistant 메시지 처리
-        if isinstance(msg, AIMessage) and msg.tool_calls:
-            # content가 비어있으면 서버가 400 에러를 낼 수 있음
-            content = msg.content if msg.content else "Calling tool..."
-            cleaned.append(AIMessage(content=content))
-        
-        # 2. Tool 역할의 메시지 처리 (vLLM이 싫어함)
-        elif isinstance(msg, ToolMessage):
-            # User 역할로 위장하여 전송하고 content가 문자열인지 확인
-            content = str(msg.content) if msg.content else "No result."
-            cleaned.append(HumanMessage(content=f"Observation: {content}"))
-            
-        elif isinstance(msg, HumanMessage):
-             cleaned.append(HumanMessage(content=str(msg.content)))
-             
-        elif isinstance(msg, SystemMessage):
-             cleaned.append(SystemMessage(content=str(msg.content)))
-        
-        else:
-            cleaned.append(msg)
-            
-    return cleaned
+    # 결과 길이가 입력과 같으므로 list(map(...))으로 만들면 리스트를 한 번에 할당합니다.
+    return list(map(_clean_message, messages))
+
+
+def _clean_message(msg: BaseMessage) -> BaseMessage:
+    # 메시지마다 isinstance를 차례로 검사하지 않고 타입별 정제 함수를 바로 찾습니다.
+    cleaner = _cleaner_for(type(msg))
+    return cleaner(msg) if cleaner else msg
+
+
+@lru_cache(maxsize=256)
+def _schema_keys(args_schema: Any) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    도구 인자 스키마의 (필수 키, 전체 키) 집합을 반환합니다.
+    
+    스키마 클래스는 바뀌지 않으므로 .schema() 결과를 클래스별로 한 번만 만들어 캐시합니다.
+    """
+    schema = args_schema.schema()
+    return frozenset(schema.get("required", [])), frozenset(schema.get("properties", {}))
 
 
 def _match_tool(parsed_json: dict, available_tools: List[BaseTool]) -> Optional[tuple]:
     if not isinstance(parsed_json, dict):
         return None
     
+    json_keys = parsed_json.keys()
     for tool in available_tools:
-        schema = tool.args_schema.schema() if hasattr(tool, 'args_schema') and tool.args_schema else {}
-        properties = schema.get("properties", {})
-        required = set(schema.get("required", []))
-        json_keys = set(parsed_json.keys())
+        args_schema = getattr(tool, 'args_schema', None)
+        if not args_schema:
+            required, properties = frozenset(), frozenset()
+        elif isinstance(args_schema, dict):
+            # MCP 도구 등은 JSON 스키마 dict를 그대로 가지고 있습니다. (해시 불가 → 캐시하지 않음)
+            required = frozenset(args_schema.get("required", []))
+            properties = frozenset(args_schema.get("properties", {}))
+        else:
+            required, properties = _schema_keys(args_schema)
         
-        if required and required.issubset(json_keys) and json_keys.issubset(set(properties.keys())):
+        if required and required <= json_keys and json_keys <= properties:
             return (tool.name, parsed_json)
-        if not required and json_keys and json_keys.issubset(set(properties.keys())):
+        if not required and json_keys and json_keys <= properties:
             return (tool.name, parsed_json)
     return None
@@ -7,13 +7,21 @@ LLM 팩토리 모듈
 
 주요 기능:
     - OpenAI ChatGPT 모델 생성 (Local LLM 호환)
-    - 임베딩 모델 생성
+    - 임베딩 모델 생성 (임베딩 결과 LRU 캐시 포함)
     - 싱글톤 캐싱 지원
 """
 
+import atexit
+import hashlib
+import io
 import logging
 import os
-from typing import Optional
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
 
 from dotenv import load_dotenv
 from langchain_core.language_models import BaseChatModel
@@ -25,13 +33,241 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def _freeze_kwargs(kwargs: dict) -> Optional[tuple]:
+    """kwargs를 캐시 키로 쓸 수 있는 튜플로 변환 (해시 불가능한 값이 있으면 None)"""
+    frozen = tuple(sorted(kwargs.items()))
+    try:
+        hash(frozen)
+    except TypeError:
+        return None
+    return frozen
+
+
+# lru_cache는 캐시 자체는 스레드 안전하지만, 여러 스레드가 동시에 캐시 미스를 내면
+# 함수를 각자 실행합니다. 그러면 같은 설정의 클라이언트(커넥션 풀)가 여러 개 생기므로
+# 인스턴스 생성은 이 잠금 안에서 한 번에 하나씩만 수행합니다.
+_BUILD_LOCK = threading.Lock()
+
+
+def _cached_build(builder, *args, kwargs: dict):
+    """생성 인자가 모두 해시 가능하면 캐시된 빌더를, 아니면 매번 새로 생성합니다."""
+    frozen = _freeze_kwargs(kwargs)
+    if frozen is None:
+        return builder.__wrapped__(*args, tuple(kwargs.items()))
+    with _BUILD_LOCK:
+        return builder(*args, frozen)
+
+
+# 임베딩 결과 캐시 크기 (텍스트 개수, 0이면 캐시 사용 안 함)
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "10000"))
+# 임베딩 결과를 파일(SQLite)에도 저장할 경로 (지정하면 재시작 후에도 같은 텍스트는 다시 임베딩하지 않음)
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 결과를 메모리에 캐시하는 래퍼 (LRU)
+    
+    RAG 세션에서는 같은 텍스트(반복 질문, 재적재되는 청크 등)가 여러 번 임베딩되므로,
+    이미 계산한 벡터는 API를 다시 호출하지 않고 돌려줍니다.
+    embed_documents는 캐시에 없는 텍스트만 한 번의 호출로 묶어 요청합니다.
+    
+    Args:
+        inner: 실제 임베딩 모델
+        maxsize: 캐시에 보관할 최대 텍스트 수
+        path: 지정하면 벡터를 이 SQLite 파일에도 저장 (메모리에 없으면 파일에서 찾음)
+    """
+    
+    def __init__(self, inner: Embeddings, maxsize: int = EMBED_CACHE_SIZE, path: Optional[str] = None):
+        self.inner = inner
+        self.maxsize = maxsize
+        # 키: 텍스트 해시, 값: 벡터 (float 리스트보다 메모리를 적게 쓰도록 array('d')로 보관)
+        self._cache: "OrderedDict[bytes, array]" = OrderedDict()
+        # 벡터 저장 시 배치를 여러 스레드에서 동시에 임베딩하므로 캐시 접근을 잠급니다.
+        self._lock = threading.Lock()
+        # 파일 캐시 - 모델이 다르면 벡터도 다르므로 모델 이름별로 구분해 저장
+        self._db: Optional[sqlite3.Connection] = None
+        self._model_key = str(getattr(inner, "model", None) or type(inner).__name__)
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(model TEXT, key BLOB, vector BLOB, PRIMARY KEY (model, key))"
+            )
+            self._db.commit()
+    
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        
+        # 1. 캐시(메모리 → 파일 순서)에 있는 벡터 채우기
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    results[i] = vector.tolist()
+        if self._db is not None:
+            found = self._load({keys[i] for i, result in enumerate(results) if result is None})
+            for i, result in enumerate(results):
+                if result is None and keys[i] in found:
+                    results[i] = found[keys[i]].tolist()
+        
+        # 2. 캐시에 없는 텍스트만 한 번에 임베딩 (같은 텍스트가 반복되면 한 번만 요청)
+        missing = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault(keys[i], texts[i])
+        if missing:
+            vectors = self.inner.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            for i, result in enumerate(results):
+                if result is None:
+                    results[i] = computed[keys[i]]
+            self._store(computed)
+        
+        return results
+    
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                return vector.tolist()
+        if self._db is not None:
+            found = self._load({key})
+            if key in found:
+                return found[key].tolist()
+        
+        result = self.inner.embed_query(text)
+        self._store({key: result})
+        return result
+    
+    def _load(self, keys: set) -> Dict[bytes, array]:
+        """파일 캐시에서 벡터를 찾아 메모리 캐시에도 올립니다."""
+        if not keys:
+            return {}
+        found: Dict[bytes, array] = {}
+        key_list = list(keys)
+        with self._lock:
+            # SQLite의 바인딩 변수 개수 제한(기본 999)을 넘지 않도록 나눠서 조회
+            for start in range(0, len(key_list), 500):
+                part = key_list[start : start + 500]
+                rows = self._db.execute(
+                    "SELECT key, vector FROM embeddings WHERE model = ? AND key IN "
+                    f"({','.join('?' * len(part))})",
+                    [self._model_key, *part],
+                )
+                for key, blob in rows:
+                    vector = array("d")
+                    vector.frombytes(blob)
+                    found[key] = vector
+            self._remember(found)
+        return found
+    
+    def _store(self, vectors: Dict[bytes, List[float]]) -> None:
+        arrays = {key: array("d", vector) for key, vector in vectors.items()}
+        with self._lock:
+            self._remember(arrays)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                    [(self._model_key, key, vector.tobytes()) for key, vector in arrays.items()],
+                )
+                self._db.commit()
+    
+    def _remember(self, vectors: Dict[bytes, array]) -> None:
+        # 호출하는 쪽에서 self._lock을 잡고 있어야 합니다.
+        if self.maxsize <= 0:
+            return
+        for key, vector in vectors.items():
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)  # 가장 오래 사용하지 않은 항목 제거
+    
+    def __repr__(self) -> str:
+        return f"CachedEmbeddings({self.inner!r})"
+
+
+def _with_embedding_cache(embeddings: Embeddings) -> Embeddings:
+    """EMBED_CACHE_SIZE가 0보다 크거나 EMBED_CACHE_PATH가 있으면 임베딩 캐시 래퍼를 씌웁니다."""
+    if EMBED_CACHE_SIZE <= 0 and not EMBED_CACHE_PATH:
+        return embeddings
+    return CachedEmbeddings(embeddings, maxsize=EMBED_CACHE_SIZE, path=EMBED_CACHE_PATH)
+
+
+@lru_cache(maxsize=32)
+def _build_openai_llm(
+    api_key: str,
+    model: str,
+    temperature: float,
+    base_url: Optional[str],
+    frozen_kwargs: tuple,
+) -> BaseChatModel:
+    logger.info(f"LLM 생성 중... (모델: {model}, URL: {base_url})")
+    
+    from langchain_openai import ChatOpenAI
+    
+    return ChatOpenAI(
+        api_key=api_key or "dummy-key",
+        model=model,
+        temperature=temperature,
+        base_url=base_url,
+        **dict(frozen_kwargs)
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_openai_embeddings(
+    api_key: str,
+    model: str,
+    base_url: Optional[str],
+    frozen_kwargs: tuple,
+) -> Embeddings:
+    logger.info(f"OpenAI 임베딩 모델 생성 중... (모델: {model})")
+    
+    from langchain_openai import OpenAIEmbeddings
+    
+    return _with_embedding_cache(OpenAIEmbeddings(
+        api_key=api_key or "dummy-key",
+        model=model,
+        base_url=base_url,
+        **dict(frozen_kwargs)
+    ))
+
+
+@lru_cache(maxsize=32)
+def _build_ollama_embeddings(
+    model: str,
+    base_url: Optional[str],
+    frozen_kwargs: tuple,
+) -> Embeddings:
+    logger.info(f"Ollama 임베딩 모델 생성 중... (모델: {model}, URL: {base_url})")
+    
+    from langchain_ollama import OllamaEmbeddings
+    
+    # OllamaEmbeddings 인스턴스 생성
+    # base_url이 None이면 OllamaEmbeddings의 기본값(http://localhost:11434) 사용
+    return _with_embedding_cache(OllamaEmbeddings(
+        model=model,
+        base_url=base_url,
+        **dict(frozen_kwargs)
+    ))
+
+
 class LLMFactory:
     """
     LLM 인스턴스를 생성하는 팩토리 클래스
-    """
     
-    _llm_cache: Optional[BaseChatModel] = None
-    _embeddings_cache: dict[str, Embeddings] = {}
+    같은 설정(모델, URL, 추가 파라미터)으로 다시 요청하면 이전에 만든 인스턴스를
+    돌려줍니다. (추가 파라미터에 해시할 수 없는 값이 있으면 매번 새로 생성)
+    """
     
     @classmethod
     def create_openai_llm(
@@ -43,59 +279,22 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """OpenAI ChatGPT 모델 인스턴스 생성"""
-        
-        # 캐시 확인 (kwargs가 없을 때만 캐시 사용)
-        if not kwargs and cls._llm_cache is not None:
-            return cls._llm_cache
-
-        logger.info(f"LLM 생성 중... (모델: {model}, URL: {base_url})")
-        
-        from langchain_openai import ChatOpenAI
-        
-        llm = ChatOpenAI(
-            api_key=api_key or "dummy-key",
-            model=model,
-            temperature=temperature,
-            base_url=base_url,
-            **kwargs
+        return _cached_build(
+            _build_openai_llm, api_key, model, temperature, base_url, kwargs=kwargs
         )
-        
-        # 캐시 저장 (kwargs가 없을 때만)
-        if not kwargs:
-            cls._llm_cache = llm
-
-        return llm
     
     @classmethod
     def create_openai_embeddings(
         cls,
         api_key: str,
         model: str = "text-embedding-3-small",
+        base_url: Optional[str] = None,
         **kwargs
     ) -> Embeddings:
         """OpenAI 임베딩 모델 인스턴스 생성"""
-        
-        # 캐시 키 생성
-        cache_key = f"openai_{model}"
-        
-        if not kwargs and cache_key in cls._embeddings_cache:
-            return cls._embeddings_cache[cache_key]
-
-        logger.info(f"OpenAI 임베딩 모델 생성 중... (모델: {model})")
-        
-        from langchain_openai import OpenAIEmbeddings
-        
-        embeddings = OpenAIEmbeddings(
-            api_key=api_key or "dummy-key",
-            model=model,
-            base_url=kwargs.pop("base_url", None),
-            **kwargs
+        return _cached_build(
+            _build_openai_embeddings, api_key, model, base_url, kwargs=kwargs
         )
-        
-        if not kwargs:
-            cls._embeddings_cache[cache_key] = embeddings
-
-        return embeddings
     
     @classmethod
     def create_ollama_embeddings(
@@ -114,54 +313,132 @@ class LLMFactory:
         Returns:
             Embeddings: Ollama 임베딩 인스턴스
         """
-        
-        # 캐시 키 생성
-        cache_key = f"ollama_{model}"
-        
-        # 캐시 확인 (kwargs가 없을 때만 캐시 사용)
-        if not kwargs and cache_key in cls._embeddings_cache:
-            return cls._embeddings_cache[cache_key]
+        return _cached_build(_build_ollama_embeddings, model, base_url, kwargs=kwargs)
 
-        logger.info(f"Ollama 임베딩 모델 생성 중... (모델: {model}, URL: {base_url})")
-        
-        from langchain_ollama import OllamaEmbeddings
-        
-        # OllamaEmbeddings 인스턴스 생성
-        # base_url이 None이면 OllamaEmbeddings의 기본값(http://localhost:11434) 사용
-        embeddings = OllamaEmbeddings(
-            model=model,
-            base_url=base_url,
-            **kwargs
-        )
-        
-        # 캐시 저장 (kwargs가 없을 때만)
-        if not kwargs:
-            cls._embeddings_cache[cache_key] = embeddings
 
-        return embeddings
+# 공유 커넥션 풀 설정 (LLM과 임베딩이 같은 서버를 쓰는 경우가 많으므로 함께 사용)
+_HTTP_LIMITS = dict(max_keepalive_connections=20, max_connections=50)
+
+
+@lru_cache(maxsize=1)
+def _get_http_client():
+    """LLM/임베딩 호출에 공유할 httpx.Client 반환 (Keep-Alive 커넥션 풀)
+    
+    모든 LLM/임베딩 인스턴스가 같은 커넥션 풀을 사용하므로
+    호출마다 TCP/TLS 핸드셰이크를 다시 하지 않습니다.
+    """
+    import httpx
+    
+    client = httpx.Client(limits=httpx.Limits(**_HTTP_LIMITS), timeout=60.0)
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _get_async_http_client():
+    """ainvoke 등 비동기 호출에 공유할 httpx.AsyncClient 반환
+    
+    비동기 커넥션은 처음 사용한 이벤트 루프에 묶이므로, 비동기 호출을
+    하나의 이벤트 루프에서만 실행하는 경우에만 사용합니다. (shared_async_client=True,
+    05_integrated_test.py 참고) asyncio.run()을 여러 번 호출하는 코드에서 쓰면
+    닫힌 루프에 묶인 연결 때문에 오류가 납니다.
+    """
+    import httpx
+    
+    return httpx.AsyncClient(limits=httpx.Limits(**_HTTP_LIMITS), timeout=60.0)
+
+
+async def aclose_async_http_client() -> None:
+    """
+    공유 비동기 HTTP 클라이언트의 커넥션 풀을 닫습니다.
+    
+    클라이언트가 묶인 이벤트 루프 안에서, 프로그램을 끝내기 직전에 호출합니다.
+    (닫은 뒤에는 shared_async_client=True로 만든 인스턴스의 비동기 호출을 쓸 수 없음)
+    """
+    if not _get_async_http_client.cache_info().currsize:
+        return
+    client = _get_async_http_client()
+    _get_async_http_client.cache_clear()
+    await client.aclose()
+
+
+def _with_shared_http_clients(kwargs: dict, share_async: bool = False) -> dict:
+    """
+    kwargs에 공유 HTTP 클라이언트를 기본값으로 채웁니다.
+    
+    동기 클라이언트는 항상 공유하고, 비동기 클라이언트는 share_async=True일 때만 공유합니다.
+    (공유하지 않으면 비동기 호출은 라이브러리 기본 클라이언트를 사용)
+    """
+    if "http_client" not in kwargs or (share_async and "http_async_client" not in kwargs):
+        with _BUILD_LOCK:
+            kwargs.setdefault("http_client", _get_http_client())
+            if share_async:
+                kwargs.setdefault("http_async_client", _get_async_http_client())
+    return kwargs
 
 
-def get_llm(**kwargs) -> BaseChatModel:
-    """LLM 인스턴스 반환 (싱글톤)"""
-    # 환경변수에서 LLM 설정 로드
-    api_key = os.getenv("OPENAI_API_KEY", "lm-studio")
-    model = os.getenv("OPENAI_MODEL", "local-model")
+class _LLMEnv(NamedTuple):
+    """환경변수에서 읽은 LLM/임베딩 설정"""
+    api_key: str
+    model: str
+    api_base: str
+    embedding_provider: str
+    embedding_model: str
+    embedding_base: str
+    ollama_embedding_model: str
+
+
+@lru_cache(maxsize=1)
+def _resolved_env() -> _LLMEnv:
+    """
+    LLM/임베딩 관련 환경변수를 한 번만 읽어 캐시합니다.
+    
+    설정은 실행 중에 바뀌지 않으므로 get_llm/get_embeddings 호출마다 다시 읽지 않습니다.
+    (.env를 바꾼 뒤 다시 읽어야 하면 _resolved_env.cache_clear() 호출)
+    """
     api_base = os.getenv("OPENAI_API_BASE", "http://localhost:1234/v1")
+    return _LLMEnv(
+        api_key=os.getenv("OPENAI_API_KEY", "lm-studio"),
+        model=os.getenv("OPENAI_MODEL", "local-model"),
+        api_base=api_base,
+        embedding_provider=os.getenv("EMBEDDING_PROVIDER", "openai"),
+        embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "local-embedding-model"),
+        embedding_base=os.getenv("OPENAI_EMBEDDING_API_BASE") or api_base,
+        ollama_embedding_model=os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"),
+    )
+
+
+def get_llm(shared_async_client: bool = False, **kwargs) -> BaseChatModel:
+    """LLM 인스턴스 반환 (설정별 싱글톤)
+    
+    같은 추가 파라미터(예: temperature=0.2)로 다시 호출하면 캐싱된 인스턴스를 돌려주며,
+    모든 인스턴스는 동기 커넥션 풀을 공유합니다.
+    
+    Args:
+        shared_async_client: True면 비동기 커넥션 풀도 공유합니다.
+            비동기 호출을 하나의 이벤트 루프에서만 실행할 때만 사용하세요.
+            (asyncio.run()을 여러 번 호출하는 코드에서는 False 유지)
+    """
+    # 환경변수에서 LLM 설정 로드 (캐시됨)
+    env = _resolved_env()
     
+    _with_shared_http_clients(kwargs, share_async=shared_async_client)
     return LLMFactory.create_openai_llm(
-        api_key=api_key,
-        model=model,
-        base_url=api_base,
+        api_key=env.api_key,
+        model=env.model,
+        base_url=env.api_base,
         **kwargs
     )
 
 
-def get_embeddings(**kwargs) -> Embeddings:
+def get_embeddings(shared_async_client: bool = False, **kwargs) -> Embeddings:
     """임베딩 인스턴스 반환 (싱글톤)
     
     환경변수 EMBEDDING_PROVIDER에 따라 OpenAI 또는 Ollama 임베딩을 반환합니다.
     
     Args:
+        shared_async_client: True면 (OpenAI provider에서) 비동기 커넥션 풀도 공유합니다.
+            비동기 호출을 하나의 이벤트 루프에서만 실행할 때만 사용하세요.
         **kwargs: 임베딩 모델 생성 시 전달할 추가 파라미터
         
     Returns:
@@ -171,12 +448,14 @@ def get_embeddings(**kwargs) -> Embeddings:
         >>> embeddings = get_embeddings()  # EMBEDDING_PROVIDER에 따라 자동 선택
         >>> vectors = embeddings.embed_documents(["Hello", "World"])
     """
+    env = _resolved_env()
+    
     # 인자로 넘어온 provider를 우선하고 없으면 환경변수 사용
-    provider = kwargs.pop("provider", os.getenv("EMBEDDING_PROVIDER", "openai")).lower()
+    provider = kwargs.pop("provider", env.embedding_provider).lower()
     
     if provider == "ollama":
         # Ollama 임베딩 사용 (로컬 기본 설정 사용)
-        model = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
+        model = env.ollama_embedding_model
         
         logger.info(f"Ollama 임베딩 provider 사용 (모델: {model}, 로컬 기본 설정)")
         return LLMFactory.create_ollama_embeddings(
@@ -185,19 +464,54 @@ def get_embeddings(**kwargs) -> Embeddings:
         )
     else:
         # OpenAI 임베딩 사용 (기본값)
-        api_key = os.getenv("OPENAI_API_KEY", "lm-studio")
-        model = os.getenv("OPENAI_EMBEDDING_MODEL", "local-embedding-model")
-        embedding_base = os.getenv("OPENAI_EMBEDDING_API_BASE") or os.getenv("OPENAI_API_BASE", "http://localhost:1234/v1")
+        model = env.embedding_model
         
         logger.info(f"OpenAI 임베딩 provider 사용 (모델: {model})")
+        _with_shared_http_clients(kwargs, share_async=shared_async_client)
+        # 기본값(True)이면 요청 전에 tiktoken으로 토큰화하느라 첫 호출 때 인코딩 파일을 내려받고,
+        # 텍스트 대신 토큰 ID를 보내 로컬 임베딩 서버와 맞지 않을 수 있습니다.
+        # (청크 크기가 모델 컨텍스트보다 충분히 작으므로 길이 검사는 필요 없음)
+        kwargs.setdefault("check_embedding_ctx_length", False)
         return LLMFactory.create_openai_embeddings(
-            api_key=api_key,
+            api_key=env.api_key,
             model=model,
-            base_url=embedding_base,
+            base_url=env.embedding_base,
             **kwargs
         )
 
 
+def warmup(background: bool = False) -> Optional[threading.Thread]:
+    """LLM/임베딩 모델에 아주 작은 요청을 한 번씩 보내 둡니다.
+    
+    LLM에는 1토큰만 생성하는 요청을, 임베딩 모델에는 짧은 텍스트 하나를 보내므로
+    커넥션 연결과 서버의 모델 로딩(Ollama 등은 첫 요청 때 모델을 메모리에 올림)이
+    첫 질문이 아니라 시작 단계에서 일어납니다.
+    
+    Args:
+        background: True면 백그라운드 스레드에서 실행하고 스레드를 반환합니다.
+            (사용자가 첫 질문을 입력하는 동안 준비)
+    
+    Returns:
+        Optional[threading.Thread]: background=True일 때 실행 중인 스레드
+    """
+    def run():
+        try:
+            get_llm().bind(max_tokens=1).invoke("ping")
+            get_embeddings().embed_query("warmup")
+            logger.info("LLM/임베딩 워밍업 완료")
+        except Exception as e:
+            # 워밍업 실패는 치명적이지 않음 (실제 요청에서 다시 시도하고 오류를 보고)
+            logger.warning("LLM/임베딩 워밍업 실패: %s", e)
+    
+    if not background:
+        run()
+        return None
+    
+    thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def log_llm_error(e: Exception):
     """LLM 관련 오류 상세 로깅
     
@@ -206,8 +520,16 @@ def log_llm_error(e: Exception):
         
     에러 타입별로 상세한 진단 정보를 제공하여 디버깅을 돕습니다.
     """
+    # 로깅 설정에서 ERROR가 꺼져 있으면 리포트를 만들지 않습니다.
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    
     import traceback
     
+    # 리포트를 버퍼에 모았다가 마지막에 한 번에 로거로 출력합니다.
+    # (줄마다 출력하면 오류가 몰릴 때 출력 잠금/시스템 호출이 줄 수만큼 발생하고, 여러 스레드의 리포트가 섞임)
+    buf = io.StringIO()
+    
     # 동적 임포트 (모듈이 없을 수도 있으므로 try-except로 보호)
     try:
         import openai
@@ -225,12 +547,12 @@ def log_llm_error(e: Exception):
     error_type = type(e).__name__
     error_module = type(e).__module__
     
-    print("\n" + "="*80)
-    print("❌ LLM 오류 발생!")
-    print("="*80)
-    print(f"📌 오류 타입: {error_module}.{error_type}")
-    print(f"📌 오류 메시지: {str(e)}")
-    print("-"*80)
+    print("\n" + "="*80, file=buf)
+    print("❌ LLM 오류 발생!", file=buf)
+    print("="*80, file=buf)
+    print(f"📌 오류 타입: {error_module}.{error_type}", file=buf)
+    print(f"📌 오류 메시지: {str(e)}", file=buf)
+    print("-"*80, file=buf)
     
     # =========================================================================
     # 2. 오류 타입별 상세 진단
@@ -238,82 +560,82 @@ def log_llm_error(e: Exception):
     
     # httpx 연결 오류
     if httpx and isinstance(e, httpx.ConnectError):
-        print("💡 진단: 서버 연결 실패")
-        print("   원인:")
-        print("   - LLM 서버가 실행되지 않았을 가능성")
-        print("   - 방화벽이나 네트워크 문제")
-        print("   - 잘못된 URL 설정")
-        print("\n   해결 방법:")
-        print("   1. Ollama를 사용 중이라면: 'ollama serve' 명령으로 서버 시작")
-        print("   2. LM Studio를 사용 중이라면: LM Studio 앱에서 서버 시작")
-        print("   3. URL 확인: .env 파일의 OPENAI_API_BASE 설정 확인")
+        print("💡 진단: 서버 연결 실패", file=buf)
+        print("   원인:", file=buf)
+        print("   - LLM 서버가 실행되지 않았을 가능성", file=buf)
+        print("   - 방화벽이나 네트워크 문제", file=buf)
+        print("   - 잘못된 URL 설정", file=buf)
+        print("\n   해결 방법:", file=buf)
+        print("   1. Ollama를 사용 중이라면: 'ollama serve' 명령으로 서버 시작", file=buf)
+        print("   2. LM Studio를 사용 중이라면: LM Studio 앱에서 서버 시작", file=buf)
+        print("   3. URL 확인: .env 파일의 OPENAI_API_BASE 설정 확인", file=buf)
     
     # httpx 타임아웃 오류
     elif httpx and isinstance(e, httpx.TimeoutException):
-        print("💡 진단: 서버 응답 시간 초과")
-        print("   원인:")
-        print("   - 서버가 과부하 상태")
-        print("   - 모델 로딩에 시간이 오래 걸림")
-        print("   - 네트워크 지연")
-        print("\n   해결 방법:")
-        print("   1. 서버 상태 확인")
-        print("   2. 더 가벼운 모델로 변경")
-        print("   3. timeout 설정 증가")
+        print("💡 진단: 서버 응답 시간 초과", file=buf)
+        print("   원인:", file=buf)
+        print("   - 서버가 과부하 상태", file=buf)
+        print("   - 모델 로딩에 시간이 오래 걸림", file=buf)
+        print("   - 네트워크 지연", file=buf)
+        print("\n   해결 방법:", file=buf)
+        print("   1. 서버 상태 확인", file=buf)
+        print("   2. 더 가벼운 모델로 변경", file=buf)
+        print("   3. timeout 설정 증가", file=buf)
     
     # httpx RemoteProtocolError
     elif httpx and isinstance(e, httpx.RemoteProtocolError):
-        print("💡 진단: 서버 프로토콜 오류 (응답 중단)")
-        print("   원인:")
-        print("   - 서버가 예상치 못하게 연결을 끊음")
-        print("   - 요청 형식이 서버와 맞지 않음")
-        print("   - 서버 내부 오류")
-        print("\n   해결 방법:")
-        print("   1. 서버 로그 확인 (Ollama: 터미널 출력, LM Studio: 앱 로그)")
-        print("   2. 서버 재시작")
-        print("   3. 모델이 정상적으로 로드되었는지 확인")
-        print("      - Ollama: 'ollama list' 명령으로 모델 확인")
-        print("      - LM Studio: 로드된 모델 확인")
+        print("💡 진단: 서버 프로토콜 오류 (응답 중단)", file=buf)
+        print("   원인:", file=buf)
+        print("   - 서버가 예상치 못하게 연결을 끊음", file=buf)
+        print("   - 요청 형식이 서버와 맞지 않음", file=buf)
+        print("   - 서버 내부 오류", file=buf)
+        print("\n   해결 방법:", file=buf)
+        print("   1. 서버 로그 확인 (Ollama: 터미널 출력, LM Studio: 앱 로그)", file=buf)
+        print("   2. 서버 재시작", file=buf)
+        print("   3. 모델이 정상적으로 로드되었는지 확인", file=buf)
+        print("      - Ollama: 'ollama list' 명령으로 모델 확인", file=buf)
+        print("      - LM Studio: 로드된 모델 확인", file=buf)
     
     # OpenAI API 상태 오류
     elif openai and isinstance(e, openai.APIStatusError):
         status_code = getattr(e, 'status_code', 'Unknown')
-        print(f"💡 진단: API 상태 오류 (HTTP {status_code})")
-        print("   원인:")
+        print(f"💡 진단: API 상태 오류 (HTTP {status_code})", file=buf)
+        print("   원인:", file=buf)
         if status_code == 404:
-            print("   - 모델을 찾을 수 없음 (모델명이 잘못되었을 가능성)")
+            print("   - 모델을 찾을 수 없음 (모델명이 잘못되었을 가능성)", file=buf)
         elif status_code == 401:
-            print("   - 인증 실패 (API 키가 잘못되었을 가능성)")
+            print("   - 인증 실패 (API 키가 잘못되었을 가능성)", file=buf)
         elif status_code == 500:
-            print("   - 서버 내부 오류")
+            print("   - 서버 내부 오류", file=buf)
         else:
-            print(f"   - HTTP {status_code} 오류")
-        print("\n   해결 방법:")
-        print("   1. .env 파일의 OPENAI_MODEL 설정 확인")
-        print("   2. 서버에서 사용 가능한 모델 목록 확인")
+            print(f"   - HTTP {status_code} 오류", file=buf)
+        print("\n   해결 방법:", file=buf)
+        print("   1. .env 파일의 OPENAI_MODEL 설정 확인", file=buf)
+        print("   2. 서버에서 사용 가능한 모델 목록 확인", file=buf)
     
     # OpenAI API 연결 오류
     elif openai and isinstance(e, openai.APIConnectionError):
-        print("💡 진단: API 연결 오류")
-        print("   원인:")
-        print("   - API 서버에 연결할 수 없음")
-        print("   - 네트워크 문제")
-        print("\n   해결 방법:")
-        print("   1. 인터넷 연결 확인")
-        print("   2. 프록시 설정 확인")
-        print("   3. 방화벽 설정 확인")
+        print("💡 진단: API 연결 오류", file=buf)
+        print("   원인:", file=buf)
+        print("   - API 서버에 연결할 수 없음", file=buf)
+        print("   - 네트워크 문제", file=buf)
+        print("\n   해결 방법:", file=buf)
+        print("   1. 인터넷 연결 확인", file=buf)
+        print("   2. 프록시 설정 확인", file=buf)
+        print("   3. 방화벽 설정 확인", file=buf)
     
     # 기타 오류
     else:
-        print("💡 진단: 알 수 없는 오류 타입")
-        print(f"   오류 객체 타입: {type(e)}")
-        print(f"   상세 메시지: {str(e)}")
+        print("💡 진단: 알 수 없는 오류 타입", file=buf)
+        print(f"   오류 객체 타입: {type(e)}", file=buf)
+        print(f"   상세 메시지: {str(e)}", file=buf)
     
     # =========================================================================
     # 3. 환경 변수 설정 상태 출력
     # =========================================================================
-    print("\n" + "-"*80)
-    print("🔍 현재 환경 변수 설정:")
-    print("-"*80)
+    print("\n" + "-"*80, file=buf)
+    print("🔍 현재 환경 변수 설정:", file=buf)
+    print("-"*80, file=buf)
     
     env_vars = {
         "OPENAI_API_BASE": os.getenv("OPENAI_API_BASE"),
@@ -324,34 +646,37 @@ def log_llm_error(e: Exception):
     }
     
     for key, value in env_vars.items():
-        print(f"   {key}: {value or '(설정되지 않음)'}")
+        print(f"   {key}: {value or '(설정되지 않음)'}", file=buf)
     
     # =========================================================================
     # 4. 스택 트레이스 출력
     # =========================================================================
-    print("\n" + "-"*80)
-    print("📋 전체 스택 트레이스:")
-    print("-"*80)
-    traceback.print_exc()
+    print("\n" + "-"*80, file=buf)
+    print("📋 전체 스택 트레이스:", file=buf)
+    print("-"*80, file=buf)
+    buf.write(traceback.format_exc())
     
     # =========================================================================
     # 5. 연결 테스트 방법 안내
     # =========================================================================
-    print("\n" + "-"*80)
-    print("🔧 연결 테스트 방법:")
-    print("-"*80)
+    print("\n" + "-"*80, file=buf)
+    print("🔧 연결 테스트 방법:", file=buf)
+    print("-"*80, file=buf)
     api_base = os.getenv("OPENAI_API_BASE", "http://localhost:11434")
     
     if "11434" in api_base:
-        print("   Ollama 서버 테스트:")
-        print(f"   curl {api_base.replace('/v1', '')}")
-        print("   (정상이면 'Ollama is running' 메시지 표시)")
+        print("   Ollama 서버 테스트:", file=buf)
+        print(f"   curl {api_base.replace('/v1', '')}", file=buf)
+        print("   (정상이면 'Ollama is running' 메시지 표시)", file=buf)
     elif "1234" in api_base:
-        print("   LM Studio 서버 테스트:")
-        print(f"   curl {api_base}/models")
-        print("   (정상이면 사용 가능한 모델 목록 JSON 반환)")
+        print("   LM Studio 서버 테스트:", file=buf)
+        print(f"   curl {api_base}/models", file=buf)
+        print("   (정상이면 사용 가능한 모델 목록 JSON 반환)", file=buf)
     else:
-        print(f"   API 서버 테스트:")
-        print(f"   curl {api_base}")
+        print(f"   API 서버 테스트:", file=buf)
+        print(f"   curl {api_base}", file=buf)
+    
+    print("="*80 + "\n", file=buf)
     
-    print("="*80 + "\n")
+    # 로깅 설정(핸들러, 레벨)을 따르며, 설정이 없으면 stderr로 출력됩니다.
+    logger.error("%s", buf.getvalue())
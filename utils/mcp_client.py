@@ -10,14 +10,85 @@ PowerShell Invoke-WebRequest 성공 사례를 벤치마킹하여 httpx 설정을
 
 import asyncio
 import logging
+import os
+import random
+import time
 import httpx
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_core.tools import BaseTool
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 연결 재시도 사이 최대 대기 시간(초)
+MAX_RETRY_DELAY = 30.0
+
+# streamable_http 세션이 쓰는 httpx 연결 풀 설정 (유휴 연결을 30초 동안 열어 두고 재사용)
+_MCP_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+def _pooled_httpx_client_factory(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """
+    keep-alive 연결 풀을 가진 httpx.AsyncClient를 만듭니다. (어댑터의 httpx_client_factory 자리에 주입)
+    
+    세션이 클라이언트를 async with로 열고 닫으므로 클라이언트 하나를 모든 세션이 공유할 수는 없습니다.
+    대신 세션 유지 모드(get_tools 기본값)에서는 서버별 세션이 이 클라이언트 하나를 계속 쓰므로,
+    도구를 호출할 때마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    """
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(60.0, connect=5.0),
+        auth=auth,
+        limits=_MCP_HTTP_LIMITS,
+        follow_redirects=True,
+    )
+
+
+def _supports_httpx_client_factory() -> bool:
+    """설치된 어댑터가 streamable_http 설정의 httpx_client_factory 키를 지원하는지 확인"""
+    try:
+        from langchain_mcp_adapters.sessions import StreamableHttpConnection
+    except ImportError:
+        return False
+    return "httpx_client_factory" in getattr(StreamableHttpConnection, "__annotations__", {})
+
+
+class _ReconnectingSession:
+    """
+    MCPClientManager의 서버 세션을 대신하는 객체 (도구가 이 객체에 묶임)
+    
+    도구를 호출할 때마다 관리자에게서 현재 세션을 찾아 쓰므로, ping 실패로 세션이
+    닫혔으면 그 서버 세션만 다시 열고 호출합니다. 이미 에이전트에 넘겨준 도구도
+    get_tools를 다시 부르지 않고 그대로 사용할 수 있습니다.
+    """
+    
+    def __init__(self, manager: "MCPClientManager", name: str):
+        self._manager = manager
+        self._name = name
+    
+    async def list_tools(self, *args, **kwargs):
+        session = await self._manager._session_for(self._name)
+        return await session.list_tools(*args, **kwargs)
+    
+    async def call_tool(self, *args, **kwargs):
+        session = await self._manager._session_for(self._name)
+        return await session.call_tool(*args, **kwargs)
+    
+    def __getattr__(self, attr: str):
+        # 그 밖의 속성은 현재 열린 세션의 것을 그대로 사용
+        # (세션이 닫혀 있으면 KeyError 대신 AttributeError - 다시 여는 일은 list_tools/call_tool이 맡음)
+        manager = self.__dict__.get("_manager")
+        session = manager._sessions.get(self._name) if manager is not None else None
+        if session is None:
+            raise AttributeError(f"MCP 서버 '{self.__dict__.get('_name')}' 세션이 열려 있지 않아 '{attr}' 속성이 없습니다.")
+        return getattr(session, attr)
+
+
 class MCPClientManager:
     """
     MCP 서버 연결 관리자
@@ -26,49 +97,84 @@ class MCPClientManager:
     httpx 설정을 세밀하게 제어합니다.
     """
     
+    # PowerShell 성공 사례의 헤더 세트 - 한 번만 만들고, 실수로 바뀌지 않도록 읽기 전용으로 둠
+    _DEFAULT_HEADERS = MappingProxyType({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        "Accept": "application/json, text/event-stream",
+        "Content-Type": "application/json", # 명시적으로 지정
+        "Connection": "keep-alive"
+    })
+    
     def __init__(
         self,
         server_configs: Dict[str, Any],
         max_retries: int = 3,
-        retry_delay: float = 2.0
+        retry_delay: float = 2.0,
+        tools_ttl: Optional[float] = None,
+        keepalive_interval: Optional[float] = None
     ):
         self.server_configs = server_configs
-        self.client: Optional[MultiServerMCPClient] = None
+        # MultiServerMCPClient (connect 시 생성)
+        self.client: Optional[Any] = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.connected = False
+        # 서버별로 열어 둔 세션들 - 세션마다 전용 태스크가 열고 닫음 (disconnect 시 한꺼번에 닫음)
+        self._sessions: Dict[str, Any] = {}
+        self._session_tasks: Dict[str, asyncio.Task] = {}
+        self._close_sessions: Optional[asyncio.Event] = None
+        # 세션을 여는 작업이 겹치지 않도록 막는 잠금 (같은 서버 세션을 두 번 열지 않음)
+        self._open_lock = asyncio.Lock()
+        # 한 번 받아 온 도구 목록 (같은 연결에서 다시 요청하면 그대로 반환)
+        self._tools: Optional[List[BaseTool]] = None
+        self._tools_loaded_at = 0.0
+        # 캐시된 도구가 어떤 모드(persistent_sessions)로 만들어졌는지 - 다른 모드로 요청하면 새로 받음
+        self._tools_persistent: Optional[bool] = None
+        # 여러 태스크가 동시에 get_tools를 불러도 서버에는 한 번만 요청하도록 막는 잠금
+        self._tools_lock = asyncio.Lock()
+        # 도구 목록 캐시 유효 시간(초) - 지나면 서버에서 다시 받아옴 (0 이하면 만료 없음)
+        self.tools_ttl = float(os.getenv("MCP_TOOLS_TTL", "300")) if tools_ttl is None else tools_ttl
+        # 열린 세션에 ping을 보내는 주기(초) - 유휴 연결이 끊기기 전에 확인 (0 이하면 사용 안 함)
+        # 기본값 15초는 httpx 연결 풀의 유휴 연결 유지 시간(30초)의 절반입니다.
+        self.keepalive_interval = (
+            float(os.getenv("MCP_KEEPALIVE_INTERVAL", "15")) if keepalive_interval is None else keepalive_interval
+        )
+        self._keepalive_task: Optional[asyncio.Task] = None
+        # ping 결과 통계 (성공/실패 횟수)
+        self.ping_stats: Dict[str, int] = {"ok": 0, "failed": 0}
 
     def _get_optimized_httpx_client(self):
         """
-        PowerShell 성공 사례를 100% 재현하기 위한 헤더 세트를 반환합니다.
+        PowerShell 성공 사례를 100% 재현하기 위한 헤더 세트를 반환합니다. (읽기 전용)
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept": "application/json, text/event-stream",
-            "Content-Type": "application/json", # 명시적으로 지정
-            "Connection": "keep-alive"
-        }
-        return headers
+        return self._DEFAULT_HEADERS
 
     async def connect(self) -> "MCPClientManager":
         """서버 연결 시도 (재시도 로직 포함)"""
         if self.connected:
             return self
 
-        logger.info(f"🔌 [MCP] {len(self.server_configs)}개 서버 연결 시작...")
+        logger.info("🔌 [MCP] %s개 서버 연결 시작...", len(self.server_configs))
         
         # PowerShell 성공 레시피 주입
         headers = self._get_optimized_httpx_client()
+        use_pooled_client = _supports_httpx_client_factory()
         for name, config in self.server_configs.items():
             if config.get("transport") == "streamable_http":
                 # 기존 헤더 병합
                 existing_headers = config.get("headers", {})
                 config["headers"] = {**headers, **existing_headers}
+                # 연결 풀 설정이 들어간 httpx 클라이언트 사용 (사용자가 직접 지정한 팩토리는 유지)
+                if use_pooled_client:
+                    config.setdefault("httpx_client_factory", _pooled_httpx_client_factory)
                 
                 # httpx의 타임아웃 및 프록시 설정을 위해 환경변수 무시 시도
                 # (langchain-mcp-adapters 내부적으로 httpx.AsyncClient를 생성하므로
                 #  직접 제어는 어렵지만, 필요 시 OS 환경변수를 임시로 변경할 수 있음)
-                logger.info(f"  ✅ [{name}] 정밀 헤더 적용: {config['url']}")
+                logger.info("  ✅ [%s] 정밀 헤더 적용: %s", name, config['url'])
+
+        # 어댑터는 실제로 연결할 때만 임포트 (MCP를 쓰지 않는 실행에서는 로딩 비용 없음)
+        from langchain_mcp_adapters.client import MultiServerMCPClient
 
         for attempt in range(self.max_retries):
             try:
@@ -76,35 +182,217 @@ class MCPClientManager:
                 # 어댑터 0.1.0은 생성자에서 바로 연결을 준비함
                 self.client = MultiServerMCPClient(self.server_configs)
                 self.connected = True
-                logger.info(f"✅ [MCP] 클라이언트 생성 성공 (시도 {attempt+1})")
+                logger.info("✅ [MCP] 클라이언트 생성 성공 (시도 %s)", attempt+1)
                 return self
+            except (ValueError, TypeError, KeyError) as e:
+                # 서버 설정 자체가 잘못된 경우는 다시 시도해도 같으므로 바로 실패
+                logger.error("❌ [MCP] 서버 설정 오류 (재시도 안 함): %s", e)
+                raise
             except Exception as e:
-                logger.error(f"❌ [MCP] 연결 실패 (시도 {attempt+1}): {e}")
+                logger.error("❌ [MCP] 연결 실패 (시도 %s): %s", attempt+1, e)
                 if attempt == self.max_retries - 1: raise
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
+                # 대기 시간을 2배씩 늘리되(최대 MAX_RETRY_DELAY) 무작위 편차(±50%)를 주어
+                # 여러 프로세스가 같은 순간에 재시도하지 않도록 함
+                wait_time = min(MAX_RETRY_DELAY, self.retry_delay * (2 ** attempt))
+                await asyncio.sleep(wait_time * random.uniform(0.5, 1.5))
         
         return self
 
-    async def get_tools(self) -> List[BaseTool]:
-        """도구 목록 가져오기 (오류 처리 및 로깅 강화)"""
+    async def get_tools(self, persistent_sessions: bool = True) -> List[BaseTool]:
+        """
+        도구 목록 가져오기 (오류 처리 및 로깅 강화)
+        
+        Args:
+            persistent_sessions: True면 서버별 세션을 한 번 열어 두고 모든 도구 호출이
+                그 세션을 재사용합니다. False면 어댑터 기본 동작대로 도구를 호출할 때마다
+                새 세션을 엽니다 (stdio는 서버 프로세스 재실행, HTTP는 initialize 재수행).
+        """
         if not self.client:
             raise RuntimeError("연결되지 않았습니다.")
+        
+        if self._tools_cached(persistent_sessions):
+            return list(self._tools)
+        
+        async with self._tools_lock:
+            # 잠금을 기다리는 동안 다른 태스크가 이미 받아 왔으면 그 결과를 사용
+            if self._tools_cached(persistent_sessions):
+                return list(self._tools)
             
+            try:
+                logger.info("🔧 [MCP] 서버로부터 도구 목록을 수신 중...")
+                if persistent_sessions:
+                    tools = await self._load_tools_with_sessions()
+                else:
+                    # 0.1.0에서는 await get_tools() 사용
+                    tools = await self.client.get_tools()
+                logger.info("✅ [MCP] %s개의 도구 로드 완료", len(tools))
+                self._tools = tools
+                self._tools_loaded_at = time.monotonic()
+                self._tools_persistent = persistent_sessions
+                return list(tools)
+            except Exception as e:
+                logger.error("💥 [MCP] 도구 로드 중 치명적 오류: %s", e)
+                # RemoteProtocolError 발생 시 팁 제공
+                if "RemoteProtocolError" in str(e):
+                    logger.error("💡 팁: 서버가 응답을 끊었습니다. HTTP_PROXY 환경변수를 확인하거나 서버 로그를 점검하세요.")
+                raise
+
+    def _tools_cached(self, persistent_sessions: bool) -> bool:
+        """같은 모드로 받아 둔 도구 목록이 아직 유효한지 확인
+        
+        세션 유지 모드의 도구는 열어 둔 세션에 묶여 있으므로, 모드가 다르면 캐시를 쓰지 않습니다.
+        """
+        return (
+            self._tools is not None
+            and self._tools_persistent == persistent_sessions
+            and not self._tools_expired()
+        )
+
+    def _tools_expired(self) -> bool:
+        """캐시된 도구 목록의 유효 시간이 지났는지 확인"""
+        return self.tools_ttl > 0 and time.monotonic() - self._tools_loaded_at >= self.tools_ttl
+
+    def invalidate_tools(self):
+        """캐시된 도구 목록을 버립니다. (다음 get_tools 호출 때 서버에서 다시 받아옴)"""
+        self._tools = None
+
+    async def _hold_session(self, name: str, ready: asyncio.Future):
+        """
+        서버 하나의 세션을 열고 disconnect 될 때까지 유지하는 태스크 본체
+        
+        세션은 연 태스크에서 닫아야 하므로(anyio 규칙) 여는 일과 닫는 일을 모두 이 태스크가 맡습니다.
+        """
         try:
-            logger.info("🔧 [MCP] 서버로부터 도구 목록을 수신 중...")
-            # 0.1.0에서는 await get_tools() 사용
-            tools = await self.client.get_tools()
-            logger.info(f"✅ [MCP] {len(tools)}개의 도구 로드 완료")
-            return tools
+            async with self.client.session(name) as session:
+                ready.set_result(session)
+                await self._close_sessions.wait()
         except Exception as e:
-            logger.error(f"💥 [MCP] 도구 로드 중 치명적 오류: {e}")
-            # RemoteProtocolError 발생 시 팁 제공
-            if "RemoteProtocolError" in str(e):
-                logger.error("💡 팁: 서버가 응답을 끊었습니다. HTTP_PROXY 환경변수를 확인하거나 서버 로그를 점검하세요.")
-            raise
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("⚠️ [MCP] [%s] 세션 종료 중 오류: %s", name, e)
+
+    async def _open_sessions(self, names: Optional[List[str]] = None):
+        """
+        아직 열리지 않은 서버 세션들을 동시에 엽니다. (서버 수만큼 handshake를 기다리지 않음)
+        
+        Args:
+            names: 열 서버 이름 목록 (None이면 설정된 모든 서버)
+        """
+        async with self._open_lock:
+            await self._open_missing_sessions(list(self.server_configs) if names is None else names)
+
+    async def _open_missing_sessions(self, names: List[str]):
+        if self.client is None:
+            raise RuntimeError("연결되지 않았습니다.")
+        missing = [name for name in names if name not in self._sessions]
+        if not missing:
+            return
+        if self._close_sessions is None:
+            self._close_sessions = asyncio.Event()
+        
+        loop = asyncio.get_running_loop()
+        readies = []
+        for name in missing:
+            ready = loop.create_future()
+            self._session_tasks[name] = asyncio.create_task(self._hold_session(name, ready))
+            readies.append(ready)
+        
+        # 일부 서버가 실패해도 성공한 세션은 기록해 두어야 다음 호출에서 중복으로 열지 않습니다.
+        results = await asyncio.gather(*readies, return_exceptions=True)
+        errors = []
+        for name, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                logger.error("❌ [MCP] [%s] 세션 열기 실패: %s", name, result)
+                errors.append(result)
+            else:
+                self._sessions[name] = result
+        if self._sessions and self.keepalive_interval > 0 and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+        if errors:
+            raise errors[0]
+
+    async def _session_for(self, name: str) -> Any:
+        """서버 세션을 반환합니다. ping 실패 등으로 닫혔으면 그 서버 세션만 다시 엽니다."""
+        session = self._sessions.get(name)
+        if session is None:
+            await self._open_sessions([name])
+            session = self._sessions[name]
+        return session
+
+    async def _keepalive_loop(self):
+        """keepalive_interval마다 열린 세션들에 ping을 보냅니다. (disconnect 시 취소됨)"""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            await self._ping_sessions()
+
+    async def _ping_sessions(self):
+        """
+        열린 세션마다 ping을 보내고, 응답하지 않는 세션은 닫습니다.
+        
+        끊긴 세션은 도구를 호출할 때 RemoteProtocolError로 처음 드러나므로 미리 닫아 둡니다.
+        도구는 _ReconnectingSession을 통해 세션을 찾으므로, 다음 도구 호출 때 그 서버 세션만
+        새로 열리고 이미 에이전트에 묶인 도구도 그대로 동작합니다.
+        """
+        names = list(self._sessions)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._sessions[name].send_ping(), timeout=10.0) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self.ping_stats["failed"] += 1
+                logger.warning("⚠️ [MCP] [%s] ping 실패, 세션을 닫고 다음 요청 때 다시 엽니다: %r", name, result)
+                await self._drop_session(name)
+            else:
+                self.ping_stats["ok"] += 1
+
+    async def _drop_session(self, name: str):
+        """서버 하나의 세션을 닫습니다. (다른 서버 세션과 사용자 설정은 그대로 유지)"""
+        self._sessions.pop(name, None)
+        task = self._session_tasks.pop(name, None)
+        if task is not None:
+            # 세션을 연 태스크를 취소하면 그 태스크 안에서 세션이 닫힙니다.
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _load_tools_with_sessions(self) -> List[BaseTool]:
+        """서버별 세션을 열어 두고, 그 세션에 묶인 도구들을 만듭니다."""
+        # 1. 세션 열기 - 도구 목록을 새로 받을 때도 이미 열린 세션은 그대로 재사용
+        await self._open_sessions()
+        
+        # 2. 열린 세션들에서 도구 목록은 동시에 요청 (서버 수만큼 기다리지 않음)
+        from langchain_mcp_adapters.tools import load_mcp_tools
+        names = list(self.server_configs)
+        # 도구는 세션 객체 대신 _ReconnectingSession에 묶어, 세션이 닫혔다 다시 열려도 계속 동작하게 함
+        results = await asyncio.gather(
+            *(load_mcp_tools(_ReconnectingSession(self, name)) for name in names)
+        )
+        
+        tools: List[BaseTool] = [tool for server_tools in results for tool in server_tools]
+        
+        # 서버별 결과는 한 줄로 요약하고, 도구 이름 목록은 DEBUG 레벨에서만 만듭니다.
+        logger.info(
+            "  🔗 세션 유지 모드로 도구 로드: %s",
+            ", ".join(f"[{name}] {len(server_tools)}개" for name, server_tools in zip(names, results)),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  🔨 도구 목록: %s", ", ".join(tool.name for tool in tools))
+        return tools
 
     async def disconnect(self):
         """리소스 정리"""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            await asyncio.gather(self._keepalive_task, return_exceptions=True)
+            self._keepalive_task = None
+        if self._close_sessions is not None:
+            self._close_sessions.set()
+            await asyncio.gather(*self._session_tasks.values(), return_exceptions=True)
+            self._close_sessions = None
+        self._session_tasks.clear()
+        self._sessions.clear()
+        self._tools = None
         self.client = None
         self.connected = False
         logger.info("🔌 [MCP] 모든 연결이 해제되었습니다.")
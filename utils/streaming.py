@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+스트리밍 출력 모듈
+
+LLM 토큰 스트림을 콘솔에 출력할 때 사용하는 출력 버퍼입니다.
+토큰마다 write + flush를 하면 콘솔(특히 Windows, SSH)에서 시스템 호출이
+토큰 수만큼 발생하므로, 일정 글자 수나 시간 간격마다 모아서 한 번에 출력합니다.
+
+주요 기능:
+    - 글자 수(max_chars) 또는 시간(max_delay) 기준으로 묶어서 출력
+    - 첫 토큰은 바로 출력 (첫 글자가 보이는 시간은 그대로 유지)
+    - with 블록을 빠져나갈 때 남은 내용을 자동으로 출력
+
+사용 예시:
+    from utils.streaming import StreamPrinter
+
+    with StreamPrinter() as out:
+        for chunk in llm.stream(prompt):
+            out.write(chunk.content)
+"""
+
+import sys
+import time
+from typing import List, Optional, TextIO
+
+
+class StreamPrinter:
+    """
+    토큰 스트림을 모아서 출력하는 버퍼
+
+    Args:
+        max_chars: 이 글자 수 이상 모이면 출력 (기본값: 64)
+        max_delay: 마지막 출력 후 이 시간(초)이 지나면 출력 (기본값: 0.02)
+        stream: 출력 대상 (기본값: sys.stdout)
+    """
+
+    def __init__(
+        self,
+        max_chars: int = 64,
+        max_delay: float = 0.02,
+        stream: Optional[TextIO] = None,
+    ):
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self.stream = stream or sys.stdout
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._last_flush = 0.0
+
+    def write(self, text: str) -> None:
+        """텍스트를 버퍼에 넣고, 기준을 넘으면 출력합니다."""
+        if not text:
+            return
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        if (
+            self._buffered_chars >= self.max_chars
+            or time.monotonic() - self._last_flush >= self.max_delay
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """버퍼에 남은 내용을 모두 출력합니다."""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered_chars = 0
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "StreamPrinter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
@@ -23,17 +23,27 @@ ChromaDB를 기본 백엔드로 사용하며, 문서 임베딩 및 유사도 검
     results = manager.search("쿼리 텍스트")
 """
 
+import hashlib
 import logging
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Any
+from typing import Any, Callable, List, Optional
 
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 logger = logging.getLogger(__name__)
 
+# 검색 결과 캐시에 보관할 최대 쿼리 수
+SEARCH_CACHE_SIZE = 512
+
+# load_from_file이 한 번에 읽어 들이는 최대 글자 수 (파일 전체를 메모리에 올리지 않음)
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+
 
 class VectorStoreManager:
     """
@@ -65,6 +75,7 @@ class VectorStoreManager:
         chunk_size: int = 2000,
         chunk_overlap: int = 200,
         embedding_batch_size: int = 100,
+        fast_splitter: bool = False,
     ):
         """
         VectorStoreManager 초기화
@@ -76,6 +87,8 @@ class VectorStoreManager:
             chunk_size: 텍스트 청크 크기
             chunk_overlap: 청크 간 중복 크기
             embedding_batch_size: 임베딩 배치 사이즈 (기본값: 100)
+            fast_splitter: True이고 semchunk 패키지가 설치되어 있으면 더 빠른 분할기 사용
+                (청크 경계가 기본 분할기와 조금 다를 수 있음, 없으면 기본 분할기 사용)
         """
         self.collection_name = collection_name
         self.persist_directory = persist_directory
@@ -88,20 +101,32 @@ class VectorStoreManager:
         else:
             self.embeddings = embeddings
         
-        # 텍스트 분할기 설정
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
-        )
+        # 텍스트 분할기 설정 (무거운 패키지라 매니저를 만들 때 임포트)
+        self.text_splitter = None
+        if fast_splitter:
+            self.text_splitter = _create_semchunk_splitter(chunk_size, chunk_overlap)
+        if self.text_splitter is None:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                length_function=len,
+                separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
+            )
         
         # Vector Store 초기화 (지연 초기화)
         self._vector_store: Optional[VectorStore] = None
         
+        # 검색 결과 캐시 (LRU): 키는 두 종류입니다.
+        #   ("text", 쿼리 문자열 해시, k) → 같은 문자열이면 임베딩 API 호출도 생략
+        #   ("embedding", 쿼리 임베딩 해시, k) → 표기만 다른 같은 의미의 쿼리도 재사용
+        self._search_cache: "OrderedDict[tuple, List[Document]]" = OrderedDict()
+        # search()가 여러 스레드에서 동시에 호출될 수 있으므로 캐시 접근을 잠급니다.
+        self._search_cache_lock = threading.Lock()
+        
         logger.info(
-            f"VectorStoreManager 초기화 완료 "
-            f"(컬렉션: {collection_name}, 청크 크기: {chunk_size})"
+            "VectorStoreManager 초기화 완료 (컬렉션: %s, 청크 크기: %s)",
+            collection_name, chunk_size,
         )
     
     @property
@@ -158,7 +183,7 @@ class VectorStoreManager:
             >>> print(f"생성된 청크 수: {len(chunks)}")
         """
         chunks = self.text_splitter.split_text(text)
-        logger.info(f"텍스트를 {len(chunks)}개의 청크로 분할했습니다.")
+        logger.info("텍스트를 %s개의 청크로 분할했습니다.", len(chunks))
         return chunks
     
     def split_documents(self, documents: List[Document]) -> List[Document]:
@@ -172,15 +197,14 @@ class VectorStoreManager:
             List[Document]: 분할된 Document 리스트
         """
         chunks = self.text_splitter.split_documents(documents)
-        logger.info(
-            f"{len(documents)}개의 문서를 {len(chunks)}개의 청크로 분할했습니다."
-        )
+        logger.info("%s개의 문서를 %s개의 청크로 분할했습니다.", len(documents), len(chunks))
         return chunks
     
     def add_texts(
         self,
         texts: List[str],
         metadatas: Optional[List[dict]] = None,
+        concurrency: int = 1,
     ) -> List[str]:
         """
         텍스트를 Vector Store에 추가합니다.
@@ -188,6 +212,7 @@ class VectorStoreManager:
         Args:
             texts: 추가할 텍스트 리스트
             metadatas: 각 텍스트의 메타데이터 (선택)
+            concurrency: 동시에 임베딩 요청할 배치 수 (기본값: 1, 순차 처리)
         
         Returns:
             List[str]: 추가된 문서의 ID 리스트
@@ -209,25 +234,37 @@ class VectorStoreManager:
             preview = texts[0][:100].replace('\n', ' ')
             print(f"   - 첫 번째 텍스트 미리보기: {preview}...")
         
-        logger.info(f"{len(texts)}개의 텍스트를 Vector Store에 추가 중...")
+        logger.info("%s개의 텍스트를 Vector Store에 추가 중...", len(texts))
         
-        all_ids = []
         total_texts = len(texts)
+        # 배치마다 속성(property)을 거치지 않도록 한 번만 가져옵니다.
+        # (동시 배치에서 여러 스레드가 Vector Store를 각자 만드는 일도 막음)
+        vector_store = self.vector_store
 
-        try:
-            for i in range(0, total_texts, self.embedding_batch_size):
-                # 배치 슬라이싱
-                batch_texts = texts[i : i + self.embedding_batch_size]
-                batch_metadatas = None
-                if metadatas:
-                    batch_metadatas = metadatas[i : i + self.embedding_batch_size]
+        def add_batch(i: int) -> List[str]:
+            # 배치 슬라이싱
+            batch_texts = texts[i : i + self.embedding_batch_size]
+            batch_metadatas = None
+            if metadatas:
+                batch_metadatas = metadatas[i : i + self.embedding_batch_size]
 
-                print(f"   ⏳ 배치 처리 중 ({i+1}~{min(i+self.embedding_batch_size, total_texts)} / {total_texts})...")
+            print(f"   ⏳ 배치 처리 중 ({i+1}~{min(i+self.embedding_batch_size, total_texts)} / {total_texts})...")
 
-                # 배치 추가
-                ids = self.vector_store.add_texts(texts=batch_texts, metadatas=batch_metadatas)
-                all_ids.extend(ids)
+            # 내용 기반 ID로 추가 (같은 청크를 다시 넣으면 새로 쌓이지 않고 덮어씀)
+            ids = [
+                chunk_id(text, batch_metadatas[j] if batch_metadatas else None)
+                for j, text in enumerate(batch_texts)
+            ]
+            keep = _first_occurrences(ids)
+            if len(keep) < len(ids):
+                # Chroma는 한 번의 요청 안에 같은 ID가 두 번 있으면 오류를 내므로 첫 번째만 남김
+                batch_texts = [batch_texts[j] for j in keep]
+                batch_metadatas = [batch_metadatas[j] for j in keep] if batch_metadatas else None
+                ids = [ids[j] for j in keep]
+            return vector_store.add_texts(texts=batch_texts, metadatas=batch_metadatas, ids=ids)
 
+        try:
+            all_ids = self._run_batches(total_texts, add_batch, concurrency)
             print(f"   ✅ 전체 임베딩 완료! 총 {len(all_ids)}개의 벡터가 생성되었습니다.")
 
         except Exception as e:
@@ -236,13 +273,40 @@ class VectorStoreManager:
             print(f"   오류 메시지: {str(e)}")
             raise  # 오류를 다시 던져서 상위에서 처리하도록 함
         
-        logger.info(f"{len(all_ids)}개의 텍스트가 추가되었습니다.")
+        with self._search_cache_lock:
+            self._search_cache.clear()  # 새 문서가 추가되었으므로 검색 캐시 무효화
+        logger.info("%s개의 텍스트가 추가되었습니다.", len(all_ids))
+        return all_ids
+    
+    def _run_batches(
+        self,
+        total: int,
+        add_batch: Callable[[int], List[str]],
+        concurrency: int,
+    ) -> List[str]:
+        """
+        embedding_batch_size 단위 배치의 시작 위치마다 add_batch를 실행하고 ID를 모읍니다.
+        
+        concurrency가 2 이상이면 여러 배치를 스레드 풀에서 동시에 요청합니다.
+        (임베딩 API는 요청당 왕복 시간이 커서 동시에 보내면 전체 시간이 줄어듦)
+        결과 ID는 원래 입력 순서대로 모입니다.
+        """
+        starts = range(0, total, self.embedding_batch_size)
+        all_ids: List[str] = []
+        if concurrency > 1 and len(starts) > 1:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(starts))) as pool:
+                for ids in pool.map(add_batch, starts):
+                    all_ids.extend(ids)
+        else:
+            for i in starts:
+                all_ids.extend(add_batch(i))
         return all_ids
     
     def add_documents(
         self,
         documents: List[Document],
         split: bool = True,
+        concurrency: int = 1,
     ) -> List[str]:
         """
         Document 객체들을 Vector Store에 추가합니다.
@@ -250,6 +314,9 @@ class VectorStoreManager:
         Args:
             documents: 추가할 Document 리스트
             split: 문서를 청크로 분할할지 여부 (기본값: True)
+            concurrency: 동시에 임베딩 요청할 배치 수 (기본값: 1, 순차 처리)
+                임베딩 API는 요청당 왕복 시간이 크므로, 여러 배치를 동시에
+                보내면 전체 적재 시간이 줄어듭니다.
         
         Returns:
             List[str]: 추가된 문서의 ID 리스트
@@ -263,22 +330,29 @@ class VectorStoreManager:
         print(f"   - 배치 사이즈: {self.embedding_batch_size}")
         print(f"   - 임베딩 모델 타입: {type(self.embeddings).__name__}")
         
-        logger.info(f"{len(documents)}개의 문서를 Vector Store에 추가 중...")
+        logger.info("%s개의 문서를 Vector Store에 추가 중...", len(documents))
         
-        all_ids = []
         total_docs = len(documents)
+        # 배치마다 속성(property)을 거치지 않도록 한 번만 가져옵니다.
+        # (동시 배치에서 여러 스레드가 Vector Store를 각자 만드는 일도 막음)
+        vector_store = self.vector_store
 
-        try:
-            for i in range(0, total_docs, self.embedding_batch_size):
-                # 배치 슬라이싱
-                batch_docs = documents[i : i + self.embedding_batch_size]
+        def add_batch(i: int) -> List[str]:
+            # 배치 슬라이싱
+            batch_docs = documents[i : i + self.embedding_batch_size]
 
-                print(f"   ⏳ 배치 처리 중 ({i+1}~{min(i+self.embedding_batch_size, total_docs)} / {total_docs})...")
+            print(f"   ⏳ 배치 처리 중 ({i+1}~{min(i+self.embedding_batch_size, total_docs)} / {total_docs})...")
 
-                # 배치 추가
-                ids = self.vector_store.add_documents(documents=batch_docs)
-                all_ids.extend(ids)
+            # 내용 기반 ID로 추가 (같은 청크를 다시 넣으면 새로 쌓이지 않고 덮어씀)
+            ids = [chunk_id(doc.page_content, doc.metadata) for doc in batch_docs]
+            keep = _first_occurrences(ids)
+            if len(keep) < len(ids):
+                batch_docs = [batch_docs[j] for j in keep]
+                ids = [ids[j] for j in keep]
+            return vector_store.add_documents(documents=batch_docs, ids=ids)
 
+        try:
+            all_ids = self._run_batches(total_docs, add_batch, concurrency)
             print(f"   ✅ 전체 임베딩 완료! 총 {len(all_ids)}개의 벡터가 생성되었습니다.")
 
         except Exception as e:
@@ -287,7 +361,9 @@ class VectorStoreManager:
             print(f"   오류 메시지: {str(e)}")
             raise  # 오류를 다시 던져서 상위에서 처리하도록 함
         
-        logger.info(f"{len(all_ids)}개의 문서가 추가되었습니다.")
+        with self._search_cache_lock:
+            self._search_cache.clear()  # 새 문서가 추가되었으므로 검색 캐시 무효화
+        logger.info("%s개의 문서가 추가되었습니다.", len(all_ids))
         return all_ids
     
     def search(
@@ -312,15 +388,126 @@ class VectorStoreManager:
             >>> for doc in results:
             ...     print(doc.page_content[:100])
         """
-        logger.info(f"검색 중: '{query}' (k={k})")
-        
-        results = self.vector_store.similarity_search(
-            query=query,
+        # 검색은 질문마다 호출되므로 DEBUG 레벨로 남깁니다. (%s 형식은 출력할 때만 문자열을 만듦)
+        logger.debug("검색 중: '%s' (k=%d)", query, k)
+        
+        # 필터가 있는 검색은 캐시하지 않습니다.
+        use_cache = filter is None
+        text_key = ("text", content_hash(query), k)
+        
+        # 1) 같은 문자열로 검색한 적이 있으면 임베딩 계산 없이 바로 반환
+        if use_cache:
+            cached = self._cache_get(text_key)
+            if cached is not None:
+                return cached
+        
+        # 2) 임베딩을 직접 계산하여 캐시 키로 사용하고, 같은 벡터로 검색합니다.
+        embedding = self.embeddings.embed_query(query)
+        embedding_key = ("embedding", self._embedding_key(embedding), k)
+        
+        if use_cache:
+            cached = self._cache_get(embedding_key)
+            if cached is not None:
+                self._cache_put(text_key, cached)
+                return cached
+        
+        results = self.vector_store.similarity_search_by_vector(
+            embedding=embedding,
             k=k,
             filter=filter,
         )
         
-        logger.info(f"{len(results)}개의 문서를 찾았습니다.")
+        if use_cache:
+            self._cache_put(embedding_key, results)
+            self._cache_put(text_key, results)
+        
+        logger.debug("%d개의 문서를 찾았습니다.", len(results))
+        return list(results)
+    
+    def _cache_get(self, key: tuple) -> Optional[List[Document]]:
+        """검색 캐시에서 결과를 꺼냅니다 (없으면 None)."""
+        with self._search_cache_lock:
+            results = self._search_cache.get(key)
+            if results is None:
+                return None
+            self._search_cache.move_to_end(key)
+        logger.debug("캐시 적중: %d개의 문서를 재사용합니다.", len(results))
+        return list(results)
+    
+    def _cache_put(self, key: tuple, results: List[Document]) -> None:
+        """검색 결과를 캐시에 저장하고, 용량을 넘으면 가장 오래된 항목을 버립니다."""
+        with self._search_cache_lock:
+            self._search_cache[key] = list(results)
+            self._search_cache.move_to_end(key)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+    
+    @staticmethod
+    def _embedding_key(embedding: List[float]) -> bytes:
+        """
+        쿼리 임베딩을 검색 캐시 키로 변환합니다.
+        
+        float 값을 int8로 양자화한 뒤 해시하므로, 부동소수점 오차만 다른
+        같은 질문의 임베딩도 동일한 키가 됩니다.
+        """
+        quantized = array("b", (max(-127, min(127, round(x * 127))) for x in embedding))
+        return hashlib.blake2b(quantized.tobytes(), digest_size=16).digest()
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+    ) -> List[List[Document]]:
+        """
+        여러 쿼리를 한 번에 검색합니다.
+        
+        쿼리 임베딩을 한 번의 API 호출(embed_documents)로 만들고,
+        ChromaDB에도 한 번의 query 요청으로 모든 결과를 받아옵니다.
+        쿼리마다 search()를 호출하는 것보다 왕복 횟수가 N → 1로 줄어듭니다.
+        이미 검색했던 쿼리 문자열은 search()와 같은 캐시에서 바로 꺼냅니다.
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            k: 쿼리당 반환할 문서 수 (기본값: 4)
+        
+        Returns:
+            List[List[Document]]: 쿼리 순서대로 정렬된 검색 결과 리스트
+                (Document.id에 ChromaDB 문서 ID가 채워집니다)
+        
+        Example:
+            >>> results = manager.search_batch(["LangGraph란?", "RAG란?"], k=2)
+            >>> docs = {d.id: d for group in results for d in group}
+        """
+        if not queries:
+            return []
+        
+        logger.debug("배치 검색 중: %d개 쿼리 (k=%d)", len(queries), k)
+        
+        # 이미 같은 문자열로 검색한 쿼리는 캐시에서 채우고, 나머지만 한 번에 검색합니다.
+        text_keys = [("text", content_hash(q), k) for q in queries]
+        results: List[Optional[List[Document]]] = [self._cache_get(key) for key in text_keys]
+        pending = [i for i, r in enumerate(results) if r is None]
+        
+        if pending:
+            query_embeddings = self.embeddings.embed_documents([queries[i] for i in pending])
+            raw = self.vector_store._collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                include=["documents", "metadatas"],
+            )
+            
+            for i, ids, texts, metadatas in zip(
+                pending, raw["ids"], raw["documents"], raw["metadatas"]
+            ):
+                docs = [
+                    Document(id=doc_id, page_content=text, metadata=metadata or {})
+                    for doc_id, text, metadata in zip(ids, texts, metadatas)
+                ]
+                self._cache_put(text_keys[i], docs)
+                results[i] = docs
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%d개의 문서를 찾았습니다.", sum(len(r) for r in results))
         return results
     
     def search_with_score(
@@ -338,14 +525,14 @@ class VectorStoreManager:
         Returns:
             List[tuple[Document, float]]: (Document, 유사도 점수) 튜플 리스트
         """
-        logger.info(f"점수 포함 검색 중: '{query}' (k={k})")
+        logger.debug("점수 포함 검색 중: '%s' (k=%d)", query, k)
         
         results = self.vector_store.similarity_search_with_score(
             query=query,
             k=k,
         )
         
-        logger.info(f"{len(results)}개의 문서를 찾았습니다.")
+        logger.debug("%d개의 문서를 찾았습니다.", len(results))
         return results
     
     def as_retriever(self, **kwargs) -> Any:
@@ -372,6 +559,7 @@ class VectorStoreManager:
         self,
         file_path: str,
         encoding: str = "utf-8",
+        concurrency: int = 1,
     ) -> List[str]:
         """
         텍스트 파일에서 문서를 로드하고 Vector Store에 추가합니다.
@@ -379,22 +567,61 @@ class VectorStoreManager:
         Args:
             file_path: 파일 경로
             encoding: 파일 인코딩 (기본값: utf-8)
+            concurrency: 동시에 임베딩 요청할 배치 수 (기본값: 1, 순차 처리)
         
         Returns:
             List[str]: 추가된 문서의 ID 리스트
         """
-        logger.info(f"파일 로드 중: {file_path}")
-        
-        with open(file_path, "r", encoding=encoding) as f:
-            content = f.read()
-        
-        # 청킹 및 추가
-        chunks = self.split_text(content)
-        
+        logger.info("파일 로드 중: %s", file_path)
+        
+        # 파일을 블록 단위로 읽어 청크를 만들고, 모인 청크를 배치 묶음으로 바로 추가합니다.
+        # (파일 전체 문자열, 전체 청크 리스트, 메타데이터 리스트를 동시에 들고 있지 않음)
+        group_size = self.embedding_batch_size * max(1, concurrency)
+        all_ids: List[str] = []
+        pending: List[str] = []
+        for chunk in self._iter_file_chunks(file_path, encoding):
+            pending.append(chunk)
+            if len(pending) >= group_size:
+                all_ids.extend(self._add_file_chunks(pending, file_path, concurrency))
+                pending = []
+        if pending:
+            all_ids.extend(self._add_file_chunks(pending, file_path, concurrency))
+        return all_ids
+    
+    def _add_file_chunks(self, chunks: List[str], file_path: str, concurrency: int) -> List[str]:
         # 메타데이터에 소스 파일 정보 추가
         metadatas = [{"source": file_path} for _ in chunks]
+        return self.add_texts(texts=chunks, metadatas=metadatas, concurrency=concurrency)
+    
+    def _iter_file_chunks(self, file_path: str, encoding: str):
+        """
+        파일을 READ_BLOCK_SIZE 글자씩 읽으면서 청크를 하나씩 돌려줍니다.
         
-        return self.add_texts(texts=chunks, metadatas=metadatas)
+        블록 끝의 마지막 청크는 다음 블록과 이어질 수 있으므로 내보내지 않고,
+        그 청크가 시작된 위치부터의 원문을 다음 블록 앞에 붙여 다시 분할합니다.
+        파일이 블록 하나에 들어가면 한 번에 분할한 결과와 같습니다. 더 큰 파일은 구분자 선택이
+        블록 단위로 이뤄지므로 블록 경계 근처의 청크가 한 번에 분할한 것과 조금 다를 수 있습니다.
+        (청크 크기 상한은 그대로 지켜지고, 원문이 빠지는 부분은 없음)
+        """
+        carry = ""
+        with open(file_path, "r", encoding=encoding) as f:
+            block = f.read(READ_BLOCK_SIZE)
+            while block:
+                # 다음 블록을 미리 읽어 두어 지금이 마지막 블록인지 압니다.
+                next_block = f.read(READ_BLOCK_SIZE)
+                buffer = carry + block
+                chunks = self.text_splitter.split_text(buffer)
+                if not next_block:
+                    # 마지막 블록은 끝 청크까지 그대로 내보냄 (다시 분할하지 않음)
+                    yield from chunks
+                    return
+                if chunks:
+                    yield from chunks[:-1]
+                    start = buffer.rfind(chunks[-1])
+                    carry = buffer[start:] if start >= 0 else chunks[-1] + "\n"
+                else:
+                    carry = ""
+                block = next_block
     
     def clear(self):
         """
@@ -406,10 +633,103 @@ class VectorStoreManager:
         
         # 새 Vector Store 생성으로 초기화
         self._vector_store = self._create_vector_store()
+        with self._search_cache_lock:
+            self._search_cache.clear()
         
         logger.info("Vector Store가 초기화되었습니다.")
 
 
+class _SemchunkSplitter:
+    """
+    semchunk 청커를 text_splitter 자리에 쓸 수 있게 감싼 분할기
+    
+    split_text / split_documents만 제공합니다. (VectorStoreManager가 쓰는 두 메서드)
+    """
+    
+    def __init__(self, chunker: Callable[..., List[str]], chunk_overlap: int):
+        self._chunker = chunker
+        self._chunk_overlap = chunk_overlap
+    
+    def split_text(self, text: str) -> List[str]:
+        if self._chunk_overlap:
+            return self._chunker(text, overlap=self._chunk_overlap)
+        return self._chunker(text)
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in documents
+            for chunk in self.split_text(doc.page_content)
+        ]
+
+
+def _create_semchunk_splitter(chunk_size: int, chunk_overlap: int) -> Optional[_SemchunkSplitter]:
+    """semchunk가 설치되어 있으면 글자 수 기준 분할기를 만들고, 없으면 None을 반환합니다."""
+    try:
+        import semchunk
+    except ImportError:
+        logger.warning("semchunk 패키지가 없어 기본 텍스트 분할기를 사용합니다. (pip install semchunk)")
+        return None
+    
+    # 토큰 대신 글자 수(len)로 길이를 재므로 chunk_size의 의미는 기본 분할기와 같습니다.
+    return _SemchunkSplitter(semchunk.chunkerify(len, chunk_size), chunk_overlap)
+
+
+def content_hash(text: str) -> bytes:
+    """
+    텍스트 내용의 16바이트 해시를 반환합니다.
+    
+    긴 청크 문자열 대신 고정 길이 해시를 중복 판별 키로 사용하기 위한 함수입니다.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def chunk_id(text: str, metadata: Optional[dict] = None) -> str:
+    """
+    청크 내용(과 출처)으로 정해지는 Vector Store 문서 ID를 반환합니다.
+    
+    같은 파일의 같은 청크는 항상 같은 ID가 되므로 다시 적재해도 중복으로 쌓이지 않고,
+    내용이 같아도 출처(source)가 다르면 서로 다른 문서로 저장됩니다.
+    """
+    source = metadata.get("source") if metadata else None
+    key = text if source is None else f"{source}\0{text}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _first_occurrences(ids: List[str]) -> List[int]:
+    """각 ID가 처음 나온 위치만 모아 반환합니다."""
+    seen = set()
+    keep = []
+    for i, id_ in enumerate(ids):
+        if id_ not in seen:
+            seen.add(id_)
+            keep.append(i)
+    return keep
+
+
+def dedupe_documents(documents: List[Document]) -> List[Document]:
+    """
+    page_content 기준으로 중복 문서를 제거합니다 (처음 나온 순서 유지).
+    
+    Args:
+        documents: 중복이 포함될 수 있는 Document 리스트
+    
+    Returns:
+        List[Document]: 중복이 제거된 Document 리스트
+    
+    Example:
+        >>> merged = dedupe_documents(entity_docs + semantic_docs)
+    """
+    seen = set()
+    unique = []
+    for doc in documents:
+        key = content_hash(doc.page_content)
+        if key not in seen:
+            seen.add(key)
+            unique.append(doc)
+    return unique
+
+
 # 테스트용 코드
 if __name__ == "__main__":
     # 간단한 테스트